@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import urlencode, urlsplit
+
+import aiohttp
+
+from webscraping import parse_moneycontrol_html, rows_to_frame
+
+# Make the project's src package importable when this script is run from Data/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.storage import atomic_write
+
+MONEYCONTROL_URL = "https://www.moneycontrol.com/stocks/hist_price.php"
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://www.google.com"
+}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ResponseCache:
+    """
+    On-disk cache of raw response bodies.
+
+    Bodies are stored once under the SHA-256 of their content (objects/),
+    and each request key maps to a body hash plus fetch time (index/), so
+    identical pages fetched under different URLs share storage. Entries older
+    than ttl seconds are treated as missing.
+    """
+
+    def __init__(self, cache_dir: str = "data/cache", ttl: float = 24 * 3600):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    @staticmethod
+    def request_key(url: str, params: dict = None) -> str:
+        full_url = f"{url}?{urlencode(sorted((params or {}).items()))}" if params else url
+        return hashlib.sha256(full_url.encode("utf-8")).hexdigest()
+
+    def _index_path(self, key):
+        return os.path.join(self.cache_dir, "index", key[:2], f"{key}.json")
+
+    def _object_path(self, digest):
+        return os.path.join(self.cache_dir, "objects", digest[:2], digest)
+
+    def get(self, key):
+        index_path = self._index_path(key)
+        if not os.path.exists(index_path):
+            return None
+        with open(index_path, "r") as f:
+            entry = json.load(f)
+        if self.ttl is not None and time.time() - entry["fetched_at"] > self.ttl:
+            return None
+        object_path = self._object_path(entry["sha256"])
+        if not os.path.exists(object_path):
+            return None
+        with open(object_path, "rb") as f:
+            return f.read()
+
+    def put(self, key, body: bytes, url: str = None):
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            atomic_write(object_path, body)
+        entry = {"sha256": digest, "fetched_at": time.time(), "url": url}
+        atomic_write(self._index_path(key), json.dumps(entry))
+        return digest
+
+
+class AsyncFetcher:
+    """
+    Concurrent HTTP fetcher sharing one aiohttp session and connection pool.
+
+    Each host gets its own token bucket. Transient failures (connection errors,
+    429 and 5xx) are retried with exponential backoff and jitter. Successful
+    bodies go through the on-disk cache when one is given.
+
+    Use as an async context manager:
+
+        async with AsyncFetcher(rate_per_host=2) as fetcher:
+            bodies = await fetcher.fetch_many(urls)
+    """
+
+    def __init__(self, rate_per_host: float = 1.0, burst: int = 1, max_connections: int = 20,
+                 retries: int = 3, backoff: float = 0.5, timeout: float = 30, cache: ResponseCache = None,
+                 headers: dict = None):
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+        self.headers = headers or DEFAULT_HEADERS
+        self._buckets = {}
+        self._session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        self._session = aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                              timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+
+    def _bucket(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate_per_host, self.burst)
+        return self._buckets[host]
+
+    async def fetch(self, url: str, params: dict = None) -> bytes:
+        """Return the response body for url, from cache when fresh; raises after the last retry."""
+        key = ResponseCache.request_key(url, params)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        for attempt in range(self.retries + 1):
+            await self._bucket(url).acquire()
+            try:
+                async with self._session.get(url, params=params) as response:
+                    if response.status in RETRY_STATUSES and attempt < self.retries:
+                        raise aiohttp.ClientResponseError(response.request_info, response.history,
+                                                          status=response.status)
+                    response.raise_for_status()
+                    body = await response.read()
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                retryable = not isinstance(e, aiohttp.ClientResponseError) or e.status in RETRY_STATUSES
+                if not retryable or attempt == self.retries:
+                    raise
+                await asyncio.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+
+        if self.cache is not None:
+            self.cache.put(key, body, url)
+        return body
+
+    async def fetch_many(self, requests_):
+        """
+        Fetch many (url, params) pairs concurrently.
+        Returns a list aligned with the input holding bodies or the raised exception.
+        """
+        tasks = [self.fetch(url, params) for url, params in requests_]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def fetch_moneycontrol_async(symbols, num_pages: int = 3, base_url: str = MONEYCONTROL_URL,
+                                   **fetcher_kwargs) -> dict:
+    """
+    Fetch and parse MoneyControl history pages for many symbols at once.
+    Returns {symbol: DataFrame or None}; None marks a symbol with no usable pages.
+    """
+    symbols = list(symbols)
+    requests_ = [(base_url, {"sc_id": symbol, "pageno": page})
+                 for symbol in symbols for page in range(1, num_pages + 1)]
+    async with AsyncFetcher(**fetcher_kwargs) as fetcher:
+        bodies = await fetcher.fetch_many(requests_)
+
+    rows_by_symbol = {symbol: [] for symbol in symbols}
+    for (_, params), body in zip(requests_, bodies):
+        if isinstance(body, Exception):
+            print(f"⚠️ {params['sc_id']} page {params['pageno']} failed: {body}")
+            continue
+        rows = parse_moneycontrol_html(body)
+        if rows:
+            rows_by_symbol[params["sc_id"]].extend(rows)
+    return {symbol: rows_to_frame(rows) if rows else None for symbol, rows in rows_by_symbol.items()}
+
+
+def fetch_moneycontrol_many(symbols, num_pages: int = 3, cache_dir: str = "data/cache",
+                            ttl: float = 24 * 3600, **fetcher_kwargs) -> dict:
+    """Synchronous wrapper around fetch_moneycontrol_async with the default on-disk cache."""
+    cache = ResponseCache(cache_dir, ttl) if cache_dir else None
+    return asyncio.run(fetch_moneycontrol_async(symbols, num_pages, cache=cache, **fetcher_kwargs))
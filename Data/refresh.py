@@ -0,0 +1,71 @@
+import os
+import sys
+from datetime import date, timedelta
+
+import pandas as pd
+
+from webscraping import fetch_from_yfinance
+
+# Make the project's src package importable when this script is run from Data/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.preprocessing import clean_data
+from src.storage import append_partition, last_stored_date
+
+DEFAULT_STORE = os.path.join("data", "store")
+DEFAULT_START = "2020-01-01"
+
+
+def _flatten_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """yfinance returns (field, ticker) column pairs; keep only the field names."""
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    return df
+
+
+def refresh_ticker(ticker: str, store_root: str = DEFAULT_STORE, start: str = DEFAULT_START, end: str = None,
+                   fetch=fetch_from_yfinance) -> pd.DataFrame:
+    """
+    Bring one ticker's store up to date by fetching only the missing date range.
+
+    Reads the last stored date, requests bars after it, drops any overlap with
+    what is already stored, cleans the new rows with preprocessing.clean_data
+    and appends them as a new Parquet part. Returns the cleaned new rows
+    (possibly empty), ready for e.g. Feature_Engineering.IncrementalFeatureState.update.
+    """
+    last = last_stored_date(store_root, ticker)
+    fetch_start = start if last is None else (last + timedelta(days=1)).strftime("%Y-%m-%d")
+    # yfinance treats end as exclusive, so ask for tomorrow to include today's bar
+    fetch_end = end or (date.today() + timedelta(days=1)).isoformat()
+    if fetch_start >= fetch_end:
+        return pd.DataFrame()
+
+    raw = fetch(ticker, start=fetch_start, end=fetch_end)
+    if raw is None or raw.empty:
+        return pd.DataFrame()
+
+    new_rows = clean_data(_flatten_columns(raw))
+    new_rows = new_rows[~new_rows.index.duplicated(keep="last")]
+    if last is not None:
+        new_rows = new_rows[new_rows.index > last]
+    append_partition(new_rows, store_root, ticker)
+    return new_rows
+
+
+def refresh_many(tickers, store_root: str = DEFAULT_STORE, **kwargs) -> dict:
+    """Refresh several tickers; returns {ticker: new cleaned rows}, skipping failures with a message."""
+    updates = {}
+    for ticker in tickers:
+        try:
+            updates[ticker] = refresh_ticker(ticker, store_root, **kwargs)
+            print(f"{ticker}: {len(updates[ticker])} new rows")
+        except Exception as e:
+            print(f"⚠️ Refresh failed for {ticker}: {e}")
+    return updates
+
+
+if __name__ == "__main__":
+    refresh_many(sys.argv[1:] or ["ITC.NS"])
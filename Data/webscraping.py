@@ -1,14 +1,117 @@
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
+import glob
 import time
 import os
 import yfinance as yf
+from concurrent.futures import ProcessPoolExecutor
 
-def scrape_from_moneycontrol(symbol, num_pages=3):
+# lxml is optional: when present it parses pages without building a full soup
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+MONEYCONTROL_COLUMNS = ["Date", "Open", "High", "Low", "Close", "Volume"]
+
+PRICE_TABLE_XPATH = '//table[contains(concat(" ", normalize-space(@class), " "), " tbldata14 ")]'
+
+def _parse_rows_lxml(html):
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    # Plain etree HTML parsing skips lxml.html's per-element class lookup
+    tree = etree.fromstring(html, etree.HTMLParser())
+    if tree is None:
+        return None
+    tables = tree.xpath(PRICE_TABLE_XPATH)
+    if not tables:
+        return None
+
+    rows = []
+    for row in tables[0].xpath(".//tr")[1:]:
+        cols = ["".join(td.itertext()).strip() for td in row.iter("td")]
+        if len(cols) == 6:
+            rows.append(cols)
+    return rows
+
+def _parse_rows_bs4(html):
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table", {"class": "tbldata14"})
+    if not table:
+        return None
+
+    rows = []
+    for row in table.find_all("tr")[1:]:
+        cols = [td.text.strip() for td in row.find_all("td")]
+        if len(cols) == 6:
+            rows.append(cols)
+    return rows
+
+def parse_moneycontrol_html(html):
+    """
+    Extract price rows from a MoneyControl history page.
+    Returns a list of 6-field rows, or None if the price table is missing.
+    Uses lxml XPath when installed and BeautifulSoup otherwise.
+    """
+    if etree is not None:
+        return _parse_rows_lxml(html)
+    return _parse_rows_bs4(html)
+
+def parse_moneycontrol_table(html):
+    """
+    Parse a page straight into typed columns: datetime Date, float prices, float Volume.
+    Thousands separators are stripped. Returns None if the price table is missing.
+    """
+    rows = parse_moneycontrol_html(html)
+    if rows is None:
+        return None
+    df = rows_to_frame(rows)
+    for col in MONEYCONTROL_COLUMNS[1:]:
+        df[col] = pd.to_numeric(df[col].str.replace(",", "", regex=False), errors="coerce").astype("float64")
+    return df
+
+def _parse_page_file(path):
+    with open(path, "rb") as f:
+        return parse_moneycontrol_table(f.read())
+
+def parse_raw_pages(paths="data/raw/*.html", max_workers=None):
+    """
+    Re-parse an archive of saved MoneyControl pages in a process pool.
+
+    Parameters:
+    - paths: Glob pattern or list of HTML files
+    - max_workers: Worker processes (defaults to os.cpu_count()); 1 parses inline
+
+    Returns:
+    - One typed, date-sorted DataFrame with duplicate dates removed (None if nothing parsed)
+    """
+    if isinstance(paths, str):
+        paths = sorted(glob.glob(paths))
+    if max_workers == 1:
+        frames = [_parse_page_file(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(_parse_page_file, paths, chunksize=max(1, len(paths) // 64)))
+    frames = [frame for frame in frames if frame is not None and not frame.empty]
+    if not frames:
+        return None
+    df = pd.concat(frames, ignore_index=True).sort_values("Date")
+    return df.drop_duplicates(subset="Date", keep="last").reset_index(drop=True)
+
+def rows_to_frame(rows):
+    """Build a date-sorted DataFrame from parsed MoneyControl rows."""
+    df = pd.DataFrame(rows, columns=MONEYCONTROL_COLUMNS)
+    df["Date"] = pd.to_datetime(df["Date"], format="%d-%b-%Y", errors='coerce')
+    df = df.dropna(subset=["Date"])
+    df = df.sort_values("Date")
+    return df
+
+def scrape_from_moneycontrol(symbol, num_pages=3, save_raw=True):
     """
     Attempts to scrape stock history from MoneyControl.
     Returns a DataFrame or None if scraping fails.
+    Raw pages are archived under data/raw/ unless save_raw is False.
     """
     base_url = f"https://www.moneycontrol.com/stocks/hist_price.php?sc_id={symbol}"
     headers = {
@@ -30,22 +133,16 @@ def scrape_from_moneycontrol(symbol, num_pages=3):
                 print("⚠️ MoneyControl returned error. Switching to fallback.")
                 return None  # fail early
 
-            os.makedirs("data/raw", exist_ok=True)
-            with open(f"data/raw/page_{page}.html", "w", encoding="utf-8") as f:
-                f.write(response.text)
-
-            soup = BeautifulSoup(response.content, "html.parser")
-            table = soup.find("table", {"class": "tbldata14"})
+            if save_raw:
+                os.makedirs("data/raw", exist_ok=True)
+                with open(f"data/raw/page_{page}.html", "w", encoding="utf-8") as f:
+                    f.write(response.text)
 
-            if not table:
+            rows = parse_moneycontrol_html(response.content)
+            if rows is None:
                 print("⚠️ Table not found. Skipping.")
                 continue
-
-            rows = table.find_all("tr")[1:]
-            for row in rows:
-                cols = [td.text.strip() for td in row.find_all("td")]
-                if len(cols) == 6:
-                    all_data.append(cols)
+            all_data.extend(rows)
 
             time.sleep(1)
 
@@ -54,11 +151,7 @@ def scrape_from_moneycontrol(symbol, num_pages=3):
             return None
 
     if all_data:
-        df = pd.DataFrame(all_data, columns=["Date", "Open", "High", "Low", "Close", "Volume"])
-        df["Date"] = pd.to_datetime(df["Date"], format="%d-%b-%Y", errors='coerce')
-        df = df.dropna(subset=["Date"])
-        df = df.sort_values("Date")
-        return df
+        return rows_to_frame(all_data)
     else:
         print(" No valid rows found.")
         return None
@@ -77,6 +170,29 @@ def fetch_from_yfinance(ticker="ITC.NS", start="2020-01-01", end="2023-12-31"):
         print(f"Failed to fetch from yfinance: {e}")
         return None
 
+def fetch_many_from_yfinance(tickers, start="2020-01-01", end="2023-12-31"):
+    """
+    Download several tickers with a single yfinance request.
+    Returns {ticker: DataFrame}; tickers with no data are left out.
+    """
+    tickers = list(tickers)
+    print(f"\n Downloading {len(tickers)} tickers from Yahoo Finance")
+    try:
+        data = yf.download(tickers, start=start, end=end, group_by="ticker", threads=True)
+    except Exception as e:
+        print(f"Failed to fetch from yfinance: {e}")
+        return {}
+
+    frames = {}
+    available = set(data.columns.get_level_values(0))
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+        df = data[ticker].dropna(how="all").reset_index()
+        if not df.empty:
+            frames[ticker] = df[["Date", "Open", "High", "Low", "Close", "Volume"]]
+    return frames
+
 def save_csv(df, path):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     df.to_csv(path, index=False)
@@ -1,29 +1,45 @@
 import streamlit as st
+import io
+import os
 import pandas as pd
-import matplotlib.pyplot as plt
 from src.preprocessing import clean_data
-from src.forecasting import run_forecast
-from src.outputs.plots import plot_forecast
+# Model backends (statsmodels, prophet) are imported by src.forecasting on first use,
+# and matplotlib only once there is something to plot, so the page renders quickly
+from src.forecasting import forecast_with_store
+from src.forecast_store import ForecastStore
 
 
 st.set_page_config(page_title="Stock Forecasting App", layout="wide")
 
 st.title(" Modular Stock Forecasting Dashboard")
 
+
+@st.cache_data(show_spinner=False)
+def load_and_clean(file_bytes: bytes):
+    """Parse and clean an uploaded CSV once per distinct file content."""
+    raw = pd.read_csv(io.BytesIO(file_bytes))
+    return raw, clean_data(raw.copy())
+
+
+@st.cache_resource
+def get_forecast_store():
+    """One store handle per server process, shared by all sessions."""
+    return ForecastStore()
+
+
 # Sidebar controls
 st.sidebar.header("Upload & Settings")
 uploaded_file = st.sidebar.file_uploader("Upload stock CSV", type=["csv"])
 forecast_days = st.sidebar.slider("Forecast horizon (days)", 1, 30, 7)
-
+ticker = st.sidebar.text_input(
+    "Ticker", value=os.path.splitext(uploaded_file.name)[0] if uploaded_file else "")
 # Main logic
 if uploaded_file:
-    df = pd.read_csv(uploaded_file)
-    st.subheader("Raw Data Preview")
-    st.dataframe(df.head())
-
     # Preprocessing
     try:
-        df_clean = clean_data(df)
+        df, df_clean = load_and_clean(uploaded_file.getvalue())
+        st.subheader("Raw Data Preview")
+        st.dataframe(df.head())
         st.success(" Data cleaned successfully.")
     except Exception as e:
         st.error(f"Error in preprocessing: {e}")
@@ -31,8 +47,12 @@ if uploaded_file:
 
     # Forecasting
     try:
-        forecast_df = run_forecast(df_clean, forecast_days)
+        # Precomputed batch forecasts are served first; otherwise fitted models are cached
+        # by data hash, so moving the horizon slider only re-forecasts
+        forecast_df, source = forecast_with_store(df_clean, forecast_days, ticker,
+                                                  store=get_forecast_store() if ticker else None)
         st.subheader("Forecast Output")
+        st.caption("Served from precomputed forecasts." if source == "store" else "Fitted live.")
         st.dataframe(forecast_df.tail())
     except Exception as e:
         st.error(f" Forecasting failed: {e}")
@@ -40,6 +60,8 @@ if uploaded_file:
 
     # Plotting
     try:
+        from src.outputs.plots import plot_forecast
+
         fig = plot_forecast(df_clean, forecast_df)
         st.subheader("Forecast Visualization")
         st.pyplot(fig)
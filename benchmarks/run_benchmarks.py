@@ -0,0 +1,240 @@
+"""
+Benchmark harness for preprocessing, feature engineering and model fitting.
+
+Run from the project root:
+
+    python -m benchmarks.run_benchmarks --profile quick --output benchmarks/results.json
+    python -m benchmarks.run_benchmarks --compare benchmarks/baseline.json --threshold 0.2
+
+All inputs are synthetic series generated in-process, so no network or data files are needed.
+With --compare the exit status is 1 when any case is slower than the baseline by more than
+the threshold (relative change in median time). With --check-imports it is also 1 when a
+module imported by the dashboard exceeds its cold import budget or pulls in a model library.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from datetime import datetime
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from src import Feature_Engineering as fe
+from src.preprocessing import clean_data
+
+from .synthetic import make_ohlcv, make_universe
+
+# Cold import budgets (seconds, fresh interpreter) for modules on the dashboard's startup path,
+# and libraries those modules must leave to be imported on first use
+IMPORT_BUDGETS = {"src.forecasting": 1.5, "src.preprocessing": 1.5, "src.forecast_store": 1.5}
+LAZY_MODULES = ("prophet", "cmdstanpy", "statsmodels", "sklearn", "matplotlib")
+
+PROFILES = {
+    "quick": {"rows": [1_000, 10_000], "model_rows": [1_000], "tickers": [1, 10], "repeats": 3},
+    "full": {"rows": [1_000, 10_000, 100_000, 1_000_000], "model_rows": [1_000, 10_000],
+             "tickers": [1, 10, 100, 1000], "repeats": 5},
+}
+
+
+def _feature_cases():
+    yield "add_lag_features", lambda df: fe.add_lag_features(df, "Close")
+    yield "add_rolling_features", lambda df: fe.add_rolling_features(df, "Close")
+    yield "add_date_features", lambda df: fe.add_date_features(df, df.index.to_series())
+    yield "add_volatility", lambda df: fe.add_volatility(df, "Close")
+    yield "add_momentum", lambda df: fe.add_momentum(df, "Close")
+    yield "build_features", lambda df: fe.build_features(df, "Close")
+
+
+def _once(factory):
+    """Memoize an expensive fixture so it is only built if a selected case needs it."""
+    cache = []
+
+    def get():
+        if not cache:
+            cache.append(factory())
+        return cache[0]
+    return get
+
+
+def build_cases(profile: dict):
+    """
+    Yield (case_id, prepare, run) triples. prepare() builds fresh inputs outside the
+    timed region; run(inputs) is the timed call.
+    """
+    for module in IMPORT_BUDGETS:
+        yield f"import[{module}]", lambda: None, lambda _, module=module: cold_import(module)
+
+    for n in profile["rows"]:
+        raw = make_ohlcv(n)
+        yield f"preprocessing.clean_data[rows={n}]", lambda raw=raw: raw.copy(), clean_data
+        clean = make_ohlcv(n, raw=False)
+        for name, func in _feature_cases():
+            yield f"Feature_Engineering.{name}[rows={n}]", lambda clean=clean: clean.copy(), func
+
+    from src.arima import train_arima, forecast_arima
+    for n in profile["model_rows"]:
+        close = make_ohlcv(n, raw=False)["Close"]
+        yield f"arima.train_arima[rows={n}]", lambda close=close: close, train_arima
+        yield f"arima.forecast_arima[rows={n}]", _once(lambda close=close: train_arima(close)), \
+            lambda m: forecast_arima(m, steps=30)
+
+    try:
+        from src.Prophet import train_prophet, forecast_prophet, forecast_prophet_frame
+    except ImportError:
+        train_prophet = None
+    if train_prophet is not None:
+        for n in profile["model_rows"]:
+            frame = make_ohlcv(n, raw=False)["Close"].reset_index()
+            frame.columns = ["ds", "y"]
+            yield f"Prophet.train_prophet[rows={n}]", lambda frame=frame: frame, train_prophet
+            yield f"Prophet.forecast_prophet[rows={n}]", _once(lambda frame=frame: train_prophet(frame)), \
+                lambda m: forecast_prophet(m, periods=30)
+            yield f"Prophet.train_prophet[fast,rows={n}]", lambda frame=frame: frame, \
+                lambda f: train_prophet(f, uncertainty_samples=0)
+            yield f"Prophet.train_prophet[warm,rows={n}]", _once(lambda frame=frame: (frame, train_prophet(frame))), \
+                lambda inputs: train_prophet(inputs[0], uncertainty_samples=0, init=inputs[1])
+            yield f"Prophet.forecast_prophet_frame[fast,rows={n}]", \
+                _once(lambda frame=frame: train_prophet(frame, uncertainty_samples=0)), \
+                lambda m: forecast_prophet_frame(m, 30)
+
+    from src.forecasting import run_forecast
+    for n in profile["model_rows"]:
+        clean = make_ohlcv(n, raw=False)
+        for model_type in ("ARIMA", "PROPHET") if train_prophet is not None else ("ARIMA",):
+            yield f"forecasting.run_forecast[model={model_type},rows={n}]", lambda clean=clean: clean, \
+                lambda df, model_type=model_type: run_forecast(df, 30, model_type, cache=None)
+
+    from src.batch_forecasting import run_batch_forecast
+    for n_tickers in profile["tickers"]:
+        universe = _once(lambda n_tickers=n_tickers: make_universe(n_tickers, profile["model_rows"][0]))
+        yield f"batch_forecasting.run_batch_forecast[tickers={n_tickers}]", universe, \
+            lambda u: run_batch_forecast(u, 30)
+        yield f"batch_forecasting.run_batch_forecast[model=GLOBAL,tickers={n_tickers}]", universe, \
+            lambda u: run_batch_forecast(u, 30, model_type="GLOBAL")
+
+
+def cold_import(module: str) -> dict:
+    """Import module in a fresh interpreter; returns its import time and any LAZY_MODULES it loaded."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "seconds = time.perf_counter() - start\n"
+        f"print(json.dumps({{'seconds': seconds, 'loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def check_import_budget(budgets: dict = None) -> list:
+    """Violations of the import budget as human-readable strings (empty when everything is within budget)."""
+    violations = []
+    for module, budget in (budgets or IMPORT_BUDGETS).items():
+        result = cold_import(module)
+        if result["seconds"] > budget:
+            violations.append(f"{module} took {result['seconds']:.2f}s to import (budget {budget:.2f}s)")
+        if result["loaded"]:
+            violations.append(f"{module} eagerly imports {', '.join(result['loaded'])}")
+    return violations
+
+
+def time_case(prepare, run, repeats: int) -> dict:
+    timings = []
+    for _ in range(repeats):
+        inputs = prepare()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            start = time.perf_counter()
+            run(inputs)
+            timings.append(time.perf_counter() - start)
+        plt.close("all")
+    return {"min": min(timings), "median": statistics.median(timings),
+            "mean": statistics.fmean(timings), "repeats": repeats}
+
+
+def run_benchmarks(profile_name: str = "quick", pattern: str = None) -> dict:
+    profile = PROFILES[profile_name]
+    results = {}
+    for case_id, prepare, run in build_cases(profile):
+        if pattern and pattern not in case_id:
+            continue
+        results[case_id] = time_case(prepare, run, profile["repeats"])
+        print(f"{case_id:<70} median {results[case_id]['median']:.4f}s")
+    return {
+        "meta": {
+            "profile": profile_name,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float = 0.2) -> list:
+    """
+    Cases whose median time grew by more than `threshold` relative to the baseline,
+    as (case_id, baseline_median, current_median, relative_change) tuples.
+    """
+    regressions = []
+    for case_id, stats in current["results"].items():
+        base = baseline["results"].get(case_id)
+        if base is None or base["median"] <= 0:
+            continue
+        change = stats["median"] / base["median"] - 1
+        if change > threshold:
+            regressions.append((case_id, base["median"], stats["median"], change))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--filter", dest="pattern", help="Only run cases whose id contains this text")
+    parser.add_argument("--output", default=os.path.join("benchmarks", "results.json"))
+    parser.add_argument("--compare", help="Baseline JSON file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--check-imports", action="store_true",
+                        help="Fail if startup modules exceed IMPORT_BUDGETS or import model libraries eagerly")
+    args = parser.parse_args(argv)
+
+    status = 0
+    if args.check_imports:
+        violations = check_import_budget()
+        for violation in violations:
+            print(f"IMPORT BUDGET {violation}")
+        if violations:
+            status = 1
+        else:
+            print("Import budget OK.")
+
+    current = run_benchmarks(args.profile, args.pattern)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(current, f, indent=4)
+    print(f"Saved benchmark results: {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        regressions = compare_results(current, baseline, args.threshold)
+        for case_id, base, now, change in regressions:
+            print(f"REGRESSION {case_id}: {base:.4f}s -> {now:.4f}s (+{change:.0%})")
+        if regressions:
+            return 1
+        print("No regressions against baseline.")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
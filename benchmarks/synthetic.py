@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+
+def make_ohlcv(n_rows: int, seed: int = 42, start: str = "2000-01-03", raw: bool = True) -> pd.DataFrame:
+    """
+    Synthetic daily OHLCV bars following a geometric random walk.
+
+    With raw=True the frame mirrors a downloaded CSV (string 'Date' column,
+    RangeIndex) so it can be fed to preprocessing.clean_data; otherwise the
+    dates are the index, as clean_data would return them.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start=start, periods=n_rows)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_rows)))
+    open_ = close * np.exp(rng.normal(0, 0.005, n_rows))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, n_rows)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, n_rows)))
+    volume = rng.integers(100_000, 10_000_000, n_rows)
+    df = pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+                      index=pd.DatetimeIndex(dates, name="Date"))
+    if raw:
+        df = df.reset_index()
+        df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+    return df
+
+
+def make_universe(n_tickers: int, n_rows: int, seed: int = 42, raw: bool = False) -> dict:
+    """{ticker: frame} mapping of independent synthetic series."""
+    return {f"T{i:04d}": make_ohlcv(n_rows, seed=seed + i, raw=raw) for i in range(n_tickers)}
@@ -15,12 +15,13 @@ def add_rolling_features(df, column, windows=[3, 7, 14]):
     return df
 
 def add_date_features(df, date_col):
-    """Extract date-based features."""
-    df['day'] = df[date_col].dt.day
-    df['month'] = df[date_col].dt.month
-    df['year'] = df[date_col].dt.year
-    df['dayofweek'] = df[date_col].dt.dayofweek
-    df['is_weekend'] = df[date_col].dt.dayofweek >= 5
+    """Extract date-based features from a datetime column name or a datetime Series."""
+    dates = date_col if isinstance(date_col, pd.Series) else df[date_col]
+    df['day'] = dates.dt.day.astype('int8')
+    df['month'] = dates.dt.month.astype('int8')
+    df['year'] = dates.dt.year.astype('int16')
+    df['dayofweek'] = dates.dt.dayofweek.astype('int8')
+    df['is_weekend'] = dates.dt.dayofweek >= 5
     return df
 
 def add_volatility(df, column, window=5):
@@ -33,3 +34,224 @@ def add_momentum(df, column, window=5):
     roll_mean = df[column].rolling(window).mean()
     df[f"{column}_momentum_{window}"] = df[column] - roll_mean
     return df
+
+DEFAULT_FEATURE_SPEC = {
+    "lags": [1, 2, 3],
+    "rolling_windows": [3, 7, 14],
+    "date_features": True,
+    "volatility_windows": [5],
+    "momentum_windows": [5],
+}
+
+def _rolling_mean_std(values, window, with_std=True):
+    """Rolling mean/std (ddof=1) over a 1-D array, NaN until the window is full like pandas."""
+    n = len(values)
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan) if with_std else None
+    if 0 < window <= n:
+        view = np.lib.stride_tricks.sliding_window_view(values, window)
+        mean[window - 1:] = view.mean(axis=1)
+        if with_std:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                std[window - 1:] = view.std(axis=1, ddof=1)
+    return mean, std
+
+def _date_features(index):
+    """Calendar features from a DatetimeIndex, matching add_date_features."""
+    return {
+        "day": index.day.astype("int8"),
+        "month": index.month.astype("int8"),
+        "year": index.year.astype("int16"),
+        "dayofweek": index.dayofweek.astype("int8"),
+        "is_weekend": index.dayofweek >= 5,
+    }
+
+def _feature_dtype(series):
+    """Engineered features keep a float32 source column's precision; everything else is float64."""
+    return np.float32 if series.dtype == np.float32 else np.float64
+
+def build_features(df, column, spec=None):
+    """
+    Build lag, rolling, date, volatility and momentum features in a single pass.
+
+    Produces the same columns as calling add_lag_features, add_rolling_features,
+    add_date_features (on the index), add_volatility and add_momentum in turn, but
+    computes each rolling window once from a NumPy array and attaches all new
+    columns with one concat instead of inserting them one at a time.
+    """
+    spec = {**DEFAULT_FEATURE_SPEC, **(spec or {})}
+    values = df[column].to_numpy(dtype=float)
+    n = len(values)
+
+    std_windows = set(spec["rolling_windows"]) | set(spec["volatility_windows"])
+    mean_windows = set(spec["rolling_windows"]) | set(spec["momentum_windows"])
+    stats = {}
+    for window in sorted(std_windows | mean_windows):
+        stats[window] = _rolling_mean_std(values, window, with_std=window in std_windows)
+
+    features = {}
+    for lag in spec["lags"]:
+        shifted = np.full(n, np.nan)
+        if lag < n:
+            shifted[lag:] = values[:n - lag]
+        features[f"{column}_lag_{lag}"] = shifted
+    for window in spec["rolling_windows"]:
+        features[f"{column}_roll_mean_{window}"] = stats[window][0]
+        features[f"{column}_roll_std_{window}"] = stats[window][1]
+    if spec["date_features"]:
+        index = pd.DatetimeIndex(df.index)
+        features.update(_date_features(index))
+    for window in spec["volatility_windows"]:
+        features[f"{column}_volatility_{window}"] = stats[window][1]
+    for window in spec["momentum_windows"]:
+        features[f"{column}_momentum_{window}"] = values - stats[window][0]
+
+    float_dtype = _feature_dtype(df[column])
+    feature_df = pd.DataFrame(features, index=df.index)
+    feature_df = feature_df.astype({name: float_dtype for name in feature_df.columns
+                                    if feature_df[name].dtype == np.float64})
+    return pd.concat([df.drop(columns=feature_df.columns, errors="ignore"), feature_df], axis=1)
+
+def build_panel_features(panel, column="Close", spec=None, tickers=None, ticker_col="Ticker"):
+    """
+    build_features for many tickers, returned in long format with a ticker column.
+
+    panel is a panel_store.PricePanel (each ticker is read from the memory map
+    as it is processed) or a {ticker: DataFrame} mapping.
+    """
+    if tickers is not None:
+        items = panel.items(tickers) if hasattr(panel, "tickers") else ((t, panel[t]) for t in tickers)
+    else:
+        items = panel.items()
+    frames = [build_features(df, column, spec).assign(**{ticker_col: ticker}) for ticker, df in items]
+    result = pd.concat(frames) if frames else pd.DataFrame()
+    if ticker_col in result.columns:
+        result[ticker_col] = result[ticker_col].astype("category")
+    return result
+
+class IncrementalFeatureState:
+    """
+    Streaming counterpart of build_features for appending new bars.
+
+    Keeps a ring buffer of the most recent values plus running sums, sums of
+    squares and NaN counts for every rolling window, so each new bar costs
+    O(number of features) instead of a pass over the full history. Rows
+    returned by update() match the tail of build_features() over the
+    concatenated history to floating-point tolerance.
+    """
+
+    # Running sums drift slightly with every add/remove; rebuild them from the buffer periodically
+    RESYNC_EVERY = 1000
+
+    def __init__(self, column, spec=None):
+        self.column = column
+        self.spec = {**DEFAULT_FEATURE_SPEC, **(spec or {})}
+        self.windows = sorted(set(self.spec["rolling_windows"])
+                              | set(self.spec["volatility_windows"])
+                              | set(self.spec["momentum_windows"]))
+        self.size = max([1] + self.windows + list(self.spec["lags"]))
+        self.buffer = np.full(self.size, np.nan)
+        self.count = 0
+        self.shift = None
+        self.sums = {w: 0.0 for w in self.windows}
+        self.sumsqs = {w: 0.0 for w in self.windows}
+        self.nans = {w: 0 for w in self.windows}
+
+    @classmethod
+    def from_history(cls, df, column, spec=None):
+        """Prime the state with existing history; only the last few rows are read."""
+        state = cls(column, spec)
+        state.count = max(len(df) - state.size, 0)
+        for value in df[column].to_numpy(dtype=float)[-state.size:]:
+            state._push(value)
+        return state
+
+    def _value_at(self, t):
+        """Value observed at absolute position t, or NaN if it is not available."""
+        if t < 0 or t < self.count - self.size:
+            return np.nan
+        return self.buffer[t % self.size]
+
+    def _push(self, value):
+        t = self.count
+        if self.shift is None and not np.isnan(value):
+            # Accumulate deviations from a reference value to limit cancellation in sum of squares
+            self.shift = value
+            self._resync(t)
+        for w in self.windows:
+            leaving = self._value_at(t - w) if t >= w else None
+            self._accumulate(w, value, 1)
+            if leaving is not None:
+                self._accumulate(w, leaving, -1)
+        self.buffer[t % self.size] = value
+        self.count += 1
+        if self.count % self.RESYNC_EVERY == 0:
+            self._resync(self.count)
+
+    def _accumulate(self, w, value, sign):
+        if np.isnan(value):
+            self.nans[w] += sign
+        elif self.shift is not None:
+            dev = value - self.shift
+            self.sums[w] += sign * dev
+            self.sumsqs[w] += sign * dev * dev
+
+    def _resync(self, end):
+        """Recompute running sums for every window from the values before position end."""
+        for w in self.windows:
+            window = np.array([self._value_at(t) for t in range(max(end - w, 0), end)])
+            valid = window[~np.isnan(window)]
+            dev = valid - self.shift if self.shift is not None else valid[:0]
+            self.sums[w] = float(dev.sum())
+            self.sumsqs[w] = float((dev * dev).sum())
+            self.nans[w] = int(len(window) - len(valid))
+
+    def _window_stats(self, w):
+        if self.count < w or self.nans[w] > 0:
+            return np.nan, np.nan
+        mean_dev = self.sums[w] / w
+        mean = self.shift + mean_dev
+        if w < 2:
+            return mean, np.nan
+        var = max((self.sumsqs[w] - w * mean_dev * mean_dev) / (w - 1), 0.0)
+        return mean, np.sqrt(var)
+
+    def update(self, new_df):
+        """
+        Append new bars (same layout as the history) and return only their feature rows,
+        with the columns build_features would produce.
+        """
+        column = self.column
+        lags = {lag: [] for lag in self.spec["lags"]}
+        means = {w: [] for w in self.windows}
+        stds = {w: [] for w in self.windows}
+        momenta = {w: [] for w in self.spec["momentum_windows"]}
+
+        for value in new_df[column].to_numpy(dtype=float):
+            for lag in lags:
+                lags[lag].append(self._value_at(self.count - lag))
+            self._push(value)
+            for w in self.windows:
+                mean, std = self._window_stats(w)
+                means[w].append(mean)
+                stds[w].append(std)
+            for w in momenta:
+                momenta[w].append(value - means[w][-1])
+
+        features = {f"{column}_lag_{lag}": lags[lag] for lag in lags}
+        for w in self.spec["rolling_windows"]:
+            features[f"{column}_roll_mean_{w}"] = means[w]
+            features[f"{column}_roll_std_{w}"] = stds[w]
+        if self.spec["date_features"]:
+            index = pd.DatetimeIndex(new_df.index)
+            features.update(_date_features(index))
+        for w in self.spec["volatility_windows"]:
+            features[f"{column}_volatility_{w}"] = stds[w]
+        for w in momenta:
+            features[f"{column}_momentum_{w}"] = momenta[w]
+
+        float_dtype = _feature_dtype(new_df[column])
+        feature_df = pd.DataFrame(features, index=new_df.index)
+        feature_df = feature_df.astype({name: float_dtype for name in feature_df.columns
+                                        if feature_df[name].dtype == np.float64})
+        return pd.concat([new_df.drop(columns=feature_df.columns, errors="ignore"), feature_df], axis=1)
@@ -1,51 +1,50 @@
+import os
 import pandas as pd
-from Feature_Engineering import (
-    add_lag_features,
-    add_rolling_features,
-    add_date_features,
-    add_volatility,
-    add_momentum
-)
+from Feature_Engineering import build_features
+from storage import load_frame
+from regression_forecast import default_regressors
+from metrics import cross_validate_models, summarize_folds
 from utils import setup_logging, set_seed
 
 # Optional: Only include these if the files exist in src/
 try:
-    from Model_comparison import compare_models
     from Prophet import train_prophet, forecast_prophet
     from arima import train_arima, forecast_arima
     prophet_enabled = True
     arima_enabled = True
 except ImportError:
-    print("⚠️ Optional modules not found: Prophet, ARIMA, or Model_comparison")
+    print("⚠️ Optional modules not found: Prophet or ARIMA")
     prophet_enabled = False
     arima_enabled = False
 
-from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
+# preprocessing.py writes its output under <project root>/Data/processed
+PROCESSED_PARQUET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 'Data', 'processed', 'processed_stock_data.parquet')
 
 def run_pipeline():
     setup_logging()
     set_seed()
 
-    # Load preprocessed data
+    # Load preprocessed data (columnar copy written by preprocessing.py first, CSV as a fallback)
     try:
-        df = pd.read_csv('../Data/procesed/processed_stock_data.csv')
-        print(" Loaded processed_stock_data.csv")
+        if os.path.exists(PROCESSED_PARQUET):
+            df = load_frame(PROCESSED_PARQUET)
+            print(" Loaded processed_stock_data.parquet")
+        else:
+            df = pd.read_csv('../Data/procesed/processed_stock_data.csv')
+            print(" Loaded processed_stock_data.csv")
     except FileNotFoundError:
-        print("File not found: Make sure preprocessing.py has generated processed_stock_data.csv")
+        print("File not found: Make sure preprocessing.py has generated processed_stock_data")
         return
 
     # Feature Engineering
     try:
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df = df.dropna(subset=['Date']).sort_values('Date')
-        df = df.set_index('Date')
+        if not isinstance(df.index, pd.DatetimeIndex):
+            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+            df = df.dropna(subset=['Date']).sort_values('Date')
+            df = df.set_index('Date')
 
-        df = add_lag_features(df, column='Close')
-        df = add_rolling_features(df, column='Close')
-        df = add_date_features(df, date_col=df.index.to_series())
-        df = add_volatility(df, column='Close')
-        df = add_momentum(df, column='Close')
+        df = build_features(df, column='Close')
 
         df = df.dropna()
         X = df.drop(columns=['Close'])
@@ -55,20 +54,20 @@ def run_pipeline():
         print(f"Feature engineering failed: {e}")
         return
 
-    # Model Comparison
-    if prophet_enabled and arima_enabled:
-        try:
-            models = {
-                'LinearRegression': LinearRegression(),
-                'RandomForest': RandomForestRegressor(n_estimators=100, random_state=42)
-            }
-            results = compare_models(models, X, y)
-            print(" Model Comparison Results:")
-            for model, metrics in results.items():
-                print(f"{model}: RMSE={metrics['RMSE']}, STD={metrics['STD']}")
-        except Exception as e:
-            print(f"Model comparison failed: {e}")
+    # Model Comparison (walk-forward CV, models x folds run in parallel on all cores)
+    try:
+        models = default_regressors()
+        folds = cross_validate_models(models, X, y, n_splits=5, n_jobs=-1)
+        print(" Per-fold results:")
+        print(folds[['model', 'fold', 'train_size', 'fit_seconds', 'RMSE']].to_string(index=False))
+        results = summarize_folds(folds)
+        print(" Model Comparison Results:")
+        for model, metrics in results.items():
+            print(f"{model}: RMSE={metrics['RMSE']}, STD={metrics['STD']}")
+    except Exception as e:
+        print(f"Model comparison failed: {e}")
 
+    if prophet_enabled and arima_enabled:
         # Prophet Forecasting
         try:
             prophet_df = df.reset_index()[['Date', 'Close']].rename(columns={'Date': 'ds', 'Close': 'y'})
@@ -88,7 +87,7 @@ def run_pipeline():
         except Exception as e:
             print(f"⚠️ ARIMA forecasting failed: {e}")
     else:
-        print("⚠️ Skipping model comparison and forecasting due to missing modules.")
+        print("⚠️ Skipping forecasting due to missing modules.")
 
 if __name__ == "__main__":
     run_pipeline()
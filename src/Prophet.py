@@ -1,34 +1,75 @@
 from prophet import Prophet
+from prophet.serialize import model_from_json, model_to_json
 import pandas as pd
-import matplotlib.pyplot as plt
 
-def train_prophet(df, date_col='ds', target_col='y'):
-    model = Prophet()
-    model.fit(df[[date_col, target_col]])
+try:
+    from .storage import atomic_write
+except ImportError:
+    from storage import atomic_write
+
+def train_prophet(df, date_col='ds', target_col='y', uncertainty_samples=1000, init=None):
+    """
+    Fit Prophet on a ds/y frame.
+
+    Parameters:
+    - uncertainty_samples: Draws used for yhat_lower/yhat_upper; 0 skips interval sampling
+      when only yhat is needed
+    - init: Previously fitted Prophet model (or a stan_init dict) to warm-start Stan from
+    """
+    model = Prophet(uncertainty_samples=uncertainty_samples)
+    if init is None:
+        model.fit(df[[date_col, target_col]])
+    else:
+        model.fit(df[[date_col, target_col]], init=stan_init(init) if isinstance(init, Prophet) else init)
     return model
 
+def stan_init(model) -> dict:
+    """Fitted parameters of a Prophet model in the form Stan accepts as initial values."""
+    init = {name: model.params[name][0][0] for name in ['k', 'm', 'sigma_obs']}
+    init.update({name: model.params[name][0] for name in ['delta', 'beta']})
+    return init
+
+def save_prophet_model(model, path: str) -> None:
+    """Serialize a fitted Prophet model to JSON (written atomically)."""
+    atomic_write(path, model_to_json(model))
+
+def load_prophet_model(path: str):
+    """Load a Prophet model written by save_prophet_model."""
+    with open(path, 'r') as f:
+        return model_from_json(f.read())
+
 def forecast_prophet(model, periods=30):
+    """Predict history plus `periods` future days; plotting lives in outputs.plots.plot_prophet_forecast."""
     future = model.make_future_dataframe(periods=periods)
     forecast = model.predict(future)
 
-    fig = model.plot(forecast)
-    plt.title("Prophet Forecast")
-
-    return forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']], fig
+    return forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
 
-def run_prophet_model(df: pd.DataFrame, horizon: int) -> pd.DataFrame:
-    """
-    Wrapper for training and forecasting with Prophet.
-    Assumes df has a datetime index and a 'Close' column.
-    """
+def to_prophet_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert a DataFrame with a datetime index and 'Close' column to Prophet's ds/y layout."""
     prophet_df = df.copy()
     prophet_df = prophet_df.reset_index()[['Date', 'Close']]
     prophet_df.columns = ['ds', 'y']
+    return prophet_df
 
-    model = train_prophet(prophet_df)
-    forecast, _ = forecast_prophet(model, periods=horizon)
+def forecast_prophet_frame(model, horizon: int) -> pd.DataFrame:
+    """
+    Forecast from an already fitted Prophet model without plotting.
+    Only the `horizon` future dates are predicted; returns them indexed by date with a 'Forecast' column.
+    """
+    future = model.make_future_dataframe(periods=horizon, include_history=False)
+    forecast = model.predict(future)
 
     forecast_df = forecast[['ds', 'yhat']].rename(columns={'ds': 'Date', 'yhat': 'Forecast'})
-    forecast_df = forecast_df.set_index('Date').tail(horizon)
+    forecast_df = forecast_df.set_index('Date')
 
     return forecast_df
+
+def run_prophet_model(df: pd.DataFrame, horizon: int) -> pd.DataFrame:
+    """
+    Wrapper for training and forecasting with Prophet.
+    Assumes df has a datetime index and a 'Close' column.
+    Intervals are not returned, so uncertainty sampling is skipped.
+    """
+    model = train_prophet(to_prophet_frame(df), uncertainty_samples=0)
+    return forecast_prophet_frame(model, horizon)
@@ -1,36 +1,79 @@
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from statsmodels.tsa.arima.model import ARIMA
 
-def train_arima(series: pd.Series, order=(5, 1, 0)):
+def train_arima(series: pd.Series, order=(5, 1, 0), start_params=None):
+    # Trading-day indexes have no frequency; statsmodels ignores such an index when
+    # forecasting anyway, and newer versions refuse to forecast from it at all.
+    if isinstance(series.index, pd.DatetimeIndex) and series.index.freq is None:
+        series = series.reset_index(drop=True)
     model = ARIMA(series, order=order)
-    model_fit = model.fit()
+    model_fit = model.fit(start_params=start_params)
     return model_fit
 
-def forecast_arima(model_fit, steps=30):
-    forecast = model_fit.forecast(steps=steps)
+def update_arima(model_fit, new_values, refit=False):
+    """
+    Extend a fitted ARIMA result with new observations.
 
-    fig, ax = plt.subplots()
-    ax.plot(forecast, label="ARIMA Forecast", color="orange")
-    ax.set_title("ARIMA Forecast")
-    ax.set_xlabel("Steps")
-    ax.set_ylabel("Predicted Value")
-    ax.legend()
+    Without refit the estimated parameters are kept and only the state-space
+    filter runs over the new values. With refit the parameters are
+    re-estimated on the full history, warm-started from the previous fit.
+    """
+    if not isinstance(getattr(model_fit.data, "row_labels", None), pd.DatetimeIndex):
+        new_values = np.asarray(new_values, dtype=float)
+    if refit:
+        return model_fit.append(new_values, refit=True, fit_kwargs={"start_params": model_fit.params})
+    return model_fit.append(new_values)
 
-    return forecast, fig
+class ArimaUpdater:
+    """
+    Keeps a fitted ARIMA model current as new bars arrive.
+    Parameters are only re-estimated once every `refit_every` appended bars.
+    """
 
-def run_arima_model(df: pd.DataFrame, horizon: int) -> pd.DataFrame:
+    def __init__(self, model_fit, refit_every: int = 20):
+        self.model_fit = model_fit
+        self.refit_every = refit_every
+        self.bars_since_fit = 0
+
+    @classmethod
+    def fit(cls, series: pd.Series, order=(5, 1, 0), refit_every: int = 20):
+        return cls(train_arima(series, order=order), refit_every=refit_every)
+
+    def update(self, new_values):
+        """Append new observations and return the updated results object."""
+        if len(new_values) == 0:
+            return self.model_fit
+        self.bars_since_fit += len(new_values)
+        refit = self.refit_every is not None and self.bars_since_fit >= self.refit_every
+        self.model_fit = update_arima(self.model_fit, new_values, refit=refit)
+        if refit:
+            self.bars_since_fit = 0
+        return self.model_fit
+
+def forecast_arima(model_fit, steps=30):
+    """Forecast `steps` values ahead; plotting lives in outputs.plots.plot_arima_forecast."""
+    return model_fit.forecast(steps=steps)
+
+def forecast_arima_frame(model_fit, last_date, horizon: int) -> pd.DataFrame:
     """
-    Wrapper for training and forecasting with ARIMA.
-    Assumes df has a datetime index and a 'Close' column.
+    Forecast from an already fitted ARIMA model without plotting.
+    Returns a DataFrame indexed by the next `horizon` calendar days after last_date.
     """
-    model_fit = train_arima(df["Close"])
-    forecast, _ = forecast_arima(model_fit, steps=horizon)
+    forecast = model_fit.forecast(steps=horizon)
 
-    future_dates = pd.date_range(start=df.index[-1], periods=horizon + 1, freq="D")[1:]
+    future_dates = pd.date_range(start=last_date, periods=horizon + 1, freq="D")[1:]
     forecast_df = pd.DataFrame({
         "Date": future_dates,
         "Forecast": forecast.values
     }).set_index("Date")
 
     return forecast_df
+
+def run_arima_model(df: pd.DataFrame, horizon: int) -> pd.DataFrame:
+    """
+    Wrapper for training and forecasting with ARIMA.
+    Assumes df has a datetime index and a 'Close' column.
+    """
+    model_fit = train_arima(df["Close"])
+    return forecast_arima_frame(model_fit, df.index[-1], horizon)
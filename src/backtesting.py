@@ -0,0 +1,167 @@
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .arima import train_arima, update_arima
+from .forecasting import DEFAULT_ARIMA_ORDER
+from .metrics import score_arrays
+from .panel_store import PricePanel
+from .regression_forecast import default_regressors, run_regressor_model
+from .storage import save_frame
+
+REGRESSOR_NAMES = {name.upper(): name for name in default_regressors()}
+
+
+def make_origins(n_obs: int, horizon: int, initial: int, step: int = None) -> list:
+    """
+    Forecast origins for a rolling-origin backtest.
+    Each origin is the number of training rows; the fold is scored on the next `horizon` rows.
+    """
+    step = step or horizon
+    if initial < 2:
+        raise ValueError("initial must leave at least two training rows")
+    return list(range(initial, n_obs - horizon + 1, step))
+
+
+def score_forecast(actual, predicted) -> dict:
+    """MAE, RMSE and MAPE (in percent) for aligned actual/predicted arrays."""
+    scores = score_arrays(actual, predicted)
+    return {name: float(scores[name]) for name in ("MAE", "RMSE", "MAPE")}
+
+
+def _prophet_predict(train: pd.Series, test_dates, init=None):
+    from .Prophet import train_prophet, to_prophet_frame
+
+    model = train_prophet(to_prophet_frame(train.to_frame("Close")), uncertainty_samples=0, init=init)
+    return model.predict(pd.DataFrame({"ds": test_dates}))["yhat"].to_numpy(), model
+
+
+def _regressor_predict(train: pd.Series, horizon: int, name: str):
+    model = default_regressors()[name]
+    return run_regressor_model(train.to_frame("Close"), horizon, model)["Forecast"].to_numpy()
+
+
+def _normalize_model_type(model_type: str) -> str:
+    """'ARIMA', 'PROPHET' or the name of one of the sklearn regressors (case-insensitive)."""
+    model_type = model_type.upper()
+    if model_type in REGRESSOR_NAMES:
+        return REGRESSOR_NAMES[model_type]
+    if model_type not in ("ARIMA", "PROPHET"):
+        raise ValueError(f"Unsupported model type: {model_type}")
+    return model_type
+
+
+def _close_series(source) -> pd.Series:
+    """Close prices from a Series or from a (PricePanel, ticker) pair read inside the worker."""
+    if isinstance(source, tuple):
+        panel, ticker = source
+        return panel.frame(ticker, ["Close"])["Close"].astype(float)
+    return source
+
+
+def _run_fold_block(close, origins, horizon, model_type, order, window, refit_every):
+    """
+    Score a contiguous block of folds in one worker.
+
+    For ARIMA on an expanding window the model is fitted once at the first
+    origin and then extended with update_arima between folds, re-estimating
+    parameters only every `refit_every` folds. Prophet fits warm-start Stan
+    from the previous fold's parameters.
+    """
+    close = _close_series(close)
+    rows = []
+    model_fit, last_origin, folds_since_fit = None, None, 0
+    for origin in origins:
+        start = 0 if window is None else max(origin - window, 0)
+        train = close.iloc[start:origin]
+        actual = close.iloc[origin:origin + horizon]
+        row = {"model": model_type, "origin": close.index[origin - 1], "train_size": len(train),
+               "horizon": horizon}
+        tic = time.perf_counter()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                if model_type == "ARIMA":
+                    if model_fit is not None and window is None:
+                        folds_since_fit += 1
+                        refit = refit_every is not None and folds_since_fit >= refit_every
+                        model_fit = update_arima(model_fit, close.iloc[last_origin:origin].to_numpy(),
+                                                 refit=refit)
+                        if refit:
+                            folds_since_fit = 0
+                    else:
+                        model_fit = train_arima(train, order=order)
+                    last_origin = origin
+                    predicted = model_fit.forecast(steps=horizon)
+                elif model_type == "PROPHET":
+                    predicted, model_fit = _prophet_predict(train, actual.index, init=model_fit)
+                else:
+                    predicted = _regressor_predict(train, horizon, model_type)
+            row.update(score_forecast(actual.to_numpy(), predicted))
+            row["error"] = None
+        except Exception as e:
+            model_fit = None
+            row.update({"MAE": np.nan, "RMSE": np.nan, "MAPE": np.nan, "error": f"{type(e).__name__}: {e}"})
+        row["fit_seconds"] = time.perf_counter() - tic
+        rows.append(row)
+    return rows
+
+
+def run_backtest(df: pd.DataFrame, horizon: int, model_type: str = "ARIMA", order=DEFAULT_ARIMA_ORDER,
+                 initial: int = None, step: int = None, window: int = None, max_workers: int = 1,
+                 refit_every: int = 5, output_path: str = None, ticker: str = None) -> pd.DataFrame:
+    """
+    Rolling-origin (walk-forward) out-of-sample backtest.
+
+    Parameters:
+    - df: Preprocessed DataFrame with datetime index and 'Close' column, or a
+      panel_store.PricePanel together with ticker (workers then read the shared panel
+      instead of receiving a pickled copy of the series)
+    - horizon: Rows forecast and scored per fold
+    - model_type: 'ARIMA', 'PROPHET' or a regressor name from regression_forecast.default_regressors
+    - initial: Training rows at the first origin (defaults to half the series)
+    - step: Rows between origins (defaults to horizon)
+    - window: Sliding training window length; None for an expanding window
+    - max_workers: Folds are split into contiguous blocks, one block per worker process
+    - refit_every: For expanding-window ARIMA, re-estimate parameters every N folds and
+      otherwise extend the previous fit with the new observations
+    - output_path: Optional .parquet/.feather file to write the fold results to; read it
+      back with storage.load_frame(output_path, date_col=None)
+
+    Returns:
+    - One row per fold with origin, train_size, MAE, RMSE, MAPE, fit_seconds and error
+    """
+    model_type = _normalize_model_type(model_type)
+    if isinstance(df, PricePanel):
+        source = (df, ticker)
+        close = _close_series(source)
+    else:
+        close = source = df["Close"].astype(float)
+    origins = make_origins(len(close), horizon, initial or len(close) // 2, step)
+
+    n_blocks = max(1, min(max_workers, len(origins)))
+    blocks = [list(block) for block in np.array_split(origins, n_blocks) if len(block)]
+    if n_blocks == 1:
+        block_rows = [_run_fold_block(close, blocks[0], horizon, model_type, order, window, refit_every)] \
+            if blocks else []
+    else:
+        with ProcessPoolExecutor(max_workers=n_blocks) as executor:
+            block_rows = list(executor.map(
+                _run_fold_block, [source] * len(blocks), blocks, [horizon] * len(blocks),
+                [model_type] * len(blocks), [order] * len(blocks), [window] * len(blocks),
+                [refit_every] * len(blocks)))
+
+    results = pd.DataFrame([row for rows in block_rows for row in rows])
+    if not results.empty:
+        results.insert(1, "fold", range(len(results)))
+    if output_path is not None:
+        save_frame(results, output_path)
+    return results
+
+
+def summarize_backtest(results: pd.DataFrame) -> pd.DataFrame:
+    """Mean fold metrics per model."""
+    return results.groupby("model")[["MAE", "RMSE", "MAPE", "fit_seconds"]].mean()
@@ -0,0 +1,147 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+from .forecasting import run_forecast, series_fingerprint, worker_context, worker_initializer, DEFAULT_ARIMA_ORDER
+from .instrumentation import stage
+from .panel_store import PricePanel, as_frame
+from .order_selection import (
+    DEFAULT_ORDER_STORE,
+    load_order_store,
+    order_record,
+    select_order,
+    update_order_store,
+)
+
+
+def split_by_ticker(data, ticker_col: str = "Ticker") -> dict:
+    """
+    Normalize batch input to a {ticker: DataFrame} mapping.
+    Accepts either a mapping already or a long-format frame with a ticker column.
+    A PricePanel maps every ticker to the panel itself, which pickles as its path,
+    so workers read their tickers from the shared memory map (see panel_store.as_frame).
+    """
+    if isinstance(data, PricePanel):
+        return {ticker: data for ticker in data.tickers}
+    if isinstance(data, pd.DataFrame):
+        if ticker_col not in data.columns:
+            raise ValueError(f"Long-format input must contain a '{ticker_col}' column.")
+        return {ticker: group.drop(columns=[ticker_col])
+                for ticker, group in data.groupby(ticker_col, sort=False, observed=True)}
+    return dict(data)
+
+
+def _forecast_chunk(chunk, horizon, model_type, order, ticker_col, known_orders):
+    """Worker entry point: forecast every (ticker, df) pair in chunk, never raising."""
+    frames, failures, selected = [], {}, {}
+    for ticker, df in chunk:
+        try:
+            df = as_frame(df, ticker)
+            ticker_order = order
+            if order == "auto" and model_type.upper() == "ARIMA":
+                if ticker in known_orders:
+                    ticker_order = tuple(known_orders[ticker]["order"])
+                else:
+                    ticker_order, score = select_order(df["Close"])
+                    selected[ticker] = order_record(ticker_order, score, "aic", len(df))
+            elif order == "auto":
+                ticker_order = DEFAULT_ARIMA_ORDER
+            with stage("forecast", ticker=ticker, rows=len(df), model=model_type):
+                forecast_df = run_forecast(df, horizon, model_type, order=ticker_order, cache=None)
+            frames.append(forecast_df.assign(**{ticker_col: ticker}))
+        except Exception as e:
+            failures[ticker] = f"{type(e).__name__}: {e}"
+    return frames, failures, selected
+
+
+def _chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def run_batch_forecast(data, horizon: int, model_type: str = "ARIMA", order=DEFAULT_ARIMA_ORDER,
+                       max_workers: int = None, chunksize: int = None, ticker_col: str = "Ticker",
+                       order_store: str = DEFAULT_ORDER_STORE, forecast_store=None):
+    """
+    Forecast many tickers in parallel across worker processes.
+
+    Parameters:
+    - data: {ticker: DataFrame} mapping, long-format DataFrame with a ticker column, or a
+      panel_store.PricePanel; each series must be preprocessed (datetime index and 'Close' column)
+    - horizon: Number of future days to forecast
+    - model_type: 'ARIMA', 'PROPHET' or 'GLOBAL' (one global_model.GlobalForecaster for all tickers)
+    - order: ARIMA (p, d, q) order, or 'auto' to use the order persisted for each ticker
+      in order_store and run a stepwise search (then persist it) for tickers without one
+    - max_workers: Worker process count (defaults to os.cpu_count()); 1 runs inline
+    - chunksize: Tickers per task; defaults to ~4 tasks per worker to balance load
+    - forecast_store: Optional forecast_store.ForecastStore to publish each ticker's forecast to
+
+    Returns:
+    - forecast_df: Concatenated forecasts indexed by date with a ticker column
+    - failures: {ticker: error message} for every series that could not be forecast
+    """
+    frames_by_ticker = split_by_ticker(data, ticker_col)
+    items = list(frames_by_ticker.items())
+    known_orders = load_order_store(order_store) if order == "auto" else {}
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(items) / (max_workers * 4)))
+
+    frames, failures, selected = [], {}, {}
+    chunks = list(_chunked(items, chunksize))
+    if model_type.upper() == "GLOBAL":
+        # One model fitted across every ticker and batched predicts replace the per-ticker pool
+        from .global_model import run_global_forecast
+
+        rows = data.n_rows() if isinstance(data, PricePanel) else sum(len(df) for df in frames_by_ticker.values())
+        with stage("forecast", rows=rows, model="GLOBAL"):
+            forecast_df, failures = run_global_forecast(frames_by_ticker, horizon, ticker_col=ticker_col)
+        frames = [group for _, group in forecast_df.groupby(ticker_col, sort=False)]
+    elif max_workers == 1:
+        for chunk in chunks:
+            chunk_frames, chunk_failures, chunk_selected = _forecast_chunk(
+                chunk, horizon, model_type, order, ticker_col, known_orders)
+            frames.extend(chunk_frames)
+            failures.update(chunk_failures)
+            selected.update(chunk_selected)
+    else:
+        context = worker_context([model_type], extra_modules=[__name__])
+        initializer, initargs = worker_initializer()
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                                 initializer=initializer, initargs=initargs) as executor:
+            futures = {executor.submit(_forecast_chunk, chunk, horizon, model_type, order, ticker_col,
+                                       {t: known_orders[t] for t, _ in chunk if t in known_orders}): chunk
+                       for chunk in chunks}
+            for future in as_completed(futures):
+                try:
+                    chunk_frames, chunk_failures, chunk_selected = future.result()
+                except Exception as e:
+                    # A crashed worker loses its whole chunk, not the batch
+                    chunk_frames, chunk_selected = [], {}
+                    chunk_failures = {ticker: f"{type(e).__name__}: {e}" for ticker, _ in futures[future]}
+                frames.extend(chunk_frames)
+                failures.update(chunk_failures)
+                selected.update(chunk_selected)
+
+    if selected:
+        # Workers only report new selections; the parent is the single writer of the store
+        update_order_store(selected, order_store)
+
+    if forecast_store is not None:
+        for frame in frames:
+            ticker = frame[ticker_col].iloc[0]
+            df = as_frame(frames_by_ticker[ticker], ticker)
+            ticker_order = order
+            if order == "auto":
+                ticker_order = tuple((selected.get(ticker) or known_orders[ticker])["order"]) \
+                    if model_type.upper() == "ARIMA" else DEFAULT_ARIMA_ORDER
+            forecast_store.put(ticker, model_type, ticker_order, horizon, frame.drop(columns=[ticker_col]),
+                               data_version=series_fingerprint(df["Close"]), last_bar_date=df.index[-1])
+
+    if frames:
+        forecast_df = pd.concat(frames)
+    else:
+        forecast_df = pd.DataFrame(columns=["Forecast", ticker_col],
+                                   index=pd.DatetimeIndex([], name="Date"))
+    return forecast_df, failures
@@ -0,0 +1,225 @@
+import argparse
+import fnmatch
+import glob
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from .backtesting import score_forecast
+from .dtype_policy import apply_dtype_policy
+from .ensemble import MEMBER_EXECUTORS, run_ensemble_forecast, run_member
+from .Feature_Engineering import build_features
+from .forecasting import DEFAULT_ARIMA_ORDER, MODEL_REGISTRY, worker_context, worker_initializer
+from .instrumentation import configure as configure_instrumentation, stage
+from .preprocessing import clean_data, load_raw_data
+from .storage import atomic_write, list_tickers, load_partitioned, save_frame
+from .utils import set_seed, setup_logging
+
+MODEL_CHOICES = tuple(MEMBER_EXECUTORS) + ("ENSEMBLE",)
+DEFAULT_OUTPUT_DIR = os.path.join("outputs", "runs")
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def _ticker_from_path(path: str) -> str:
+    """'data/ITC_stock_data.csv' -> 'ITC'."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem[:-len("_stock_data")] if stem.endswith("_stock_data") else stem
+
+
+def resolve_inputs(inputs, store_root: str = None) -> dict:
+    """
+    Map each ticker to its source.
+
+    Without store_root, inputs are raw CSV paths or glob patterns and the
+    ticker is taken from the file name. With store_root, inputs are ticker
+    names or fnmatch patterns matched against the partitioned store.
+    """
+    sources = {}
+    if store_root is not None:
+        available = list_tickers(store_root)
+        for pattern in inputs:
+            for ticker in fnmatch.filter(available, pattern):
+                sources[ticker] = None
+        return sources
+    for pattern in inputs:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            sources[_ticker_from_path(path)] = path
+    return sources
+
+
+def load_checkpoint(output_dir: str) -> dict:
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_checkpoint(checkpoint: dict, output_dir: str) -> None:
+    """Write the checkpoint atomically, so a crash mid-write keeps the previous one."""
+    atomic_write(os.path.join(output_dir, CHECKPOINT_FILE), json.dumps(checkpoint, indent=4))
+
+
+def _forecast(df: pd.DataFrame, horizon: int, model: str, order) -> pd.Series:
+    if model == "ENSEMBLE":
+        return run_ensemble_forecast(df, horizon, order=order)[0]["Forecast"]
+    return run_member(df, horizon, model, order)
+
+
+def run_ticker(ticker: str, source: str, models, horizon: int, output_dir: str, store_root: str = None,
+               order=DEFAULT_ARIMA_ORDER, compact: bool = True) -> dict:
+    """
+    Preprocess, build features, fit, forecast and report for one ticker.
+
+    Each model is scored on a holdout of the last `horizon` rows, then refitted
+    on the full history for the forward forecast. Outputs go to
+    <output_dir>/<ticker>/ (features.parquet, forecast.parquet, metrics.json).
+    Returns the per-model metrics; a model that fails is recorded with its error.
+    With compact=True the cleaned frame (and so the features) uses the
+    dtype_policy dtypes.
+    """
+    ticker_dir = os.path.join(output_dir, ticker)
+    with stage("preprocess", ticker=ticker) as rec:
+        if store_root is not None:
+            df = load_partitioned(store_root, tickers=[ticker]).drop(columns="Ticker")
+            if compact:
+                df = apply_dtype_policy(df)
+        else:
+            df = clean_data(load_raw_data(source), compact=compact)
+        rec["rows"] = len(df)
+
+    with stage("features", ticker=ticker, rows=len(df)):
+        save_frame(build_features(df, column="Close"), os.path.join(ticker_dir, "features.parquet"))
+
+    metrics, forecasts = {}, {}
+    train, actual = df.iloc[:-horizon], df["Close"].iloc[-horizon:]
+    for model in models:
+        try:
+            with stage("fit", ticker=ticker, rows=len(train), model=model):
+                predicted = _forecast(train, horizon, model, order)
+            metrics[model] = score_forecast(actual.to_numpy(), predicted.to_numpy())
+            with stage("forecast", ticker=ticker, rows=len(df), model=model):
+                forecasts[model] = _forecast(df, horizon, model, order).to_numpy()
+        except Exception as e:
+            logging.error(f"{ticker} {model} failed: {e}")
+            metrics[model] = {"error": f"{type(e).__name__}: {e}"}
+
+    with stage("report", ticker=ticker):
+        if forecasts:
+            future_dates = pd.date_range(start=df.index[-1], periods=horizon + 1, freq="D")[1:]
+            save_frame(pd.DataFrame(forecasts, index=pd.DatetimeIndex(future_dates, name="Date")),
+                       os.path.join(ticker_dir, "forecast.parquet"))
+        with open(os.path.join(ticker_dir, "metrics.json"), "w") as f:
+            json.dump(metrics, f, indent=4)
+    return metrics
+
+
+def save_summary(checkpoint: dict, output_dir: str, filename: str = "summary.md") -> None:
+    """Markdown table of holdout metrics for every completed ticker."""
+    with open(os.path.join(output_dir, filename), "w") as f:
+        f.write("# 📊 Forecast Summary Report\n\n")
+        f.write("| Ticker | Model | MAE | RMSE | MAPE |\n|---|---|---|---|---|\n")
+        for ticker, entry in sorted(checkpoint.items()):
+            for model, m in entry.get("metrics", {}).items():
+                if "error" in m:
+                    f.write(f"| {ticker} | {model} | failed: {m['error']} | | |\n")
+                else:
+                    f.write(f"| {ticker} | {model} | {m['MAE']:.4f} | {m['RMSE']:.4f} | {m['MAPE']:.2f} |\n")
+
+
+def run_batch(sources: dict, models, horizon: int, output_dir: str = DEFAULT_OUTPUT_DIR, workers: int = 1,
+              resume: bool = False, store_root: str = None, compact: bool = True) -> dict:
+    """
+    Run every ticker through run_ticker, checkpointing each one as it completes.
+
+    With resume=True, tickers already completed with the same models and
+    horizon are skipped, so a crashed run restarts where it stopped. The
+    parent process is the only writer of the checkpoint. Returns the checkpoint.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint = load_checkpoint(output_dir) if resume else {}
+    config = {"models": list(models), "horizon": horizon}
+    pending = [t for t in sources
+               if not (checkpoint.get(t, {}).get("status") == "done"
+                       and {k: checkpoint[t].get(k) for k in config} == config)]
+    skipped = len(sources) - len(pending)
+    if skipped:
+        print(f"Resuming: {skipped} ticker(s) already done")
+
+    def record(ticker, metrics=None, error=None):
+        entry = {**config, "finished_at": datetime.now().isoformat(timespec="seconds")}
+        entry.update({"status": "done", "metrics": metrics} if error is None else {"status": "failed", "error": error})
+        checkpoint[ticker] = entry
+        save_checkpoint(checkpoint, output_dir)
+        print(f"{ticker}: {entry['status']}" + (f" ({error})" if error else ""))
+
+    args = (models, horizon, output_dir, store_root, DEFAULT_ARIMA_ORDER, compact)
+    if workers == 1:
+        for ticker in pending:
+            try:
+                record(ticker, run_ticker(ticker, sources[ticker], *args))
+            except Exception as e:
+                record(ticker, error=f"{type(e).__name__}: {e}")
+    else:
+        context = worker_context([m for m in models if m in MODEL_REGISTRY], extra_modules=[__name__])
+        initializer, initargs = worker_initializer()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=initializer, initargs=initargs) as executor:
+            futures = {executor.submit(run_ticker, ticker, sources[ticker], *args): ticker for ticker in pending}
+            for future in as_completed(futures):
+                try:
+                    record(futures[future], future.result())
+                except Exception as e:
+                    record(futures[future], error=f"{type(e).__name__}: {e}")
+
+    save_summary(checkpoint, output_dir)
+    return checkpoint
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src",
+        description="Preprocess, build features, fit, forecast and report for many tickers.")
+    parser.add_argument("inputs", nargs="+",
+                        help="Raw CSV paths or globs (ticker taken from the file name), or ticker "
+                             "names/patterns when --store is given")
+    parser.add_argument("--store", help="Partitioned Parquet store to read cleaned data from")
+    parser.add_argument("--models", default="ARIMA,PROPHET",
+                        help=f"Comma-separated models from {', '.join(MODEL_CHOICES)}")
+    parser.add_argument("--horizon", type=int, default=30, help="Days to forecast (also the holdout length)")
+    parser.add_argument("--workers", type=int, default=1, help="Tickers processed in parallel")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--resume", action="store_true", help="Skip tickers completed by a previous run")
+    parser.add_argument("--compact", action=argparse.BooleanOptionalAction, default=True,
+                        help="Use compact dtypes (float32 prices, int Volume) where values survive the cast")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    models = [m.strip() for m in args.models.split(",") if m.strip()]
+    lookup = {m.upper(): m for m in MODEL_CHOICES}
+    unknown = [m for m in models if m.upper() not in lookup]
+    if unknown:
+        raise SystemExit(f"Unknown models: {', '.join(unknown)} (choose from {', '.join(MODEL_CHOICES)})")
+    models = [lookup[m.upper()] for m in models]
+
+    sources = resolve_inputs(args.inputs, args.store)
+    if not sources:
+        raise SystemExit("No tickers matched the given inputs.")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    setup_logging(os.path.join(args.output_dir, "run.log"))
+    set_seed()
+    configure_instrumentation(metrics_path=os.path.join(args.output_dir, "stages.jsonl"))
+
+    checkpoint = run_batch(sources, models, args.horizon, args.output_dir, args.workers, args.resume, args.store,
+                           args.compact)
+    failed = [t for t in sources if checkpoint.get(t, {}).get("status") != "done"]
+    print(f"Done: {len(sources) - len(failed)}/{len(sources)} tickers; report in "
+          f"{os.path.join(args.output_dir, 'summary.md')}")
+    return 1 if failed else 0
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# Calendar fields from preprocessing.engineer_time_features and Feature_Engineering date features
+CALENDAR_DTYPES = {
+    'Year': 'int16', 'Month': 'int8', 'Day': 'int8', 'Weekday': 'int8',
+    'Quarter': 'int8', 'DayOfYear': 'int16',
+    'year': 'int16', 'month': 'int8', 'day': 'int8', 'dayofweek': 'int8',
+}
+
+# float32 keeps ~7 significant digits: ample for prices quoted to 2-4 decimals
+DEFAULT_RTOL = 1e-6
+
+
+def fits_float32(values, rtol: float = DEFAULT_RTOL) -> bool:
+    """True if casting to float32 changes no value by more than rtol (relative)."""
+    values = np.asarray(values, dtype=np.float64)
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return True
+    if np.abs(finite).max() > np.finfo(np.float32).max:
+        return False
+    roundtrip = finite.astype(np.float32).astype(np.float64)
+    scale = np.maximum(np.abs(finite), np.finfo(np.float32).tiny)
+    return bool(np.max(np.abs(roundtrip - finite) / scale) <= rtol)
+
+
+def compact_dtypes(df: pd.DataFrame, rtol: float = DEFAULT_RTOL, ticker_col: str = 'Ticker') -> dict:
+    """
+    The {column: dtype} casts apply_dtype_policy would make for df.
+
+    - float columns (prices and engineered features) become float32 when every value
+      survives the cast within rtol, otherwise they stay float64
+    - integral Volume becomes the smallest integer type that holds it
+    - calendar fields become int8/int16
+    - the ticker column becomes categorical
+    """
+    casts = {}
+    for col in df.columns:
+        dtype = df[col].dtype
+        if col == ticker_col:
+            casts[col] = 'category'
+        elif col in CALENDAR_DTYPES and pd.api.types.is_integer_dtype(dtype):
+            casts[col] = CALENDAR_DTYPES[col]
+        elif col == 'Volume':
+            volume = df[col]
+            if volume.notna().all() and np.array_equal(volume, np.round(volume)):
+                casts[col] = pd.to_numeric(volume.astype('int64'), downcast='integer').dtype
+            elif pd.api.types.is_float_dtype(dtype) and fits_float32(volume, rtol):
+                casts[col] = 'float32'
+        elif dtype == np.float64 and fits_float32(df[col], rtol):
+            casts[col] = 'float32'
+    return casts
+
+
+def widen_dtypes(casts: dict, other: dict) -> dict:
+    """
+    Casts valid for two frames, given compact_dtypes of each.
+
+    Integer casts widen to the larger type; a column keeps a cast only if both
+    frames agree on its kind, so values from either frame survive it.
+    """
+    widened = {}
+    for col in casts.keys() & other.keys():
+        a, b = casts[col], other[col]
+        if a == 'category' or b == 'category':
+            if a == b:
+                widened[col] = a
+        elif np.dtype(a) == np.dtype(b):
+            widened[col] = a
+        elif np.dtype(a).kind in 'iu' and np.dtype(b).kind in 'iu':
+            widened[col] = np.promote_types(a, b)
+    return widened
+
+
+def apply_dtype_policy(df: pd.DataFrame, rtol: float = DEFAULT_RTOL, ticker_col: str = 'Ticker') -> pd.DataFrame:
+    """Downcast an OHLCV or feature frame to compact dtypes (see compact_dtypes)."""
+    casts = compact_dtypes(df, rtol, ticker_col)
+    return df.astype(casts) if casts else df
+
+
+def memory_footprint(df: pd.DataFrame) -> int:
+    """Total bytes used by a frame, including its index."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def verify_dtype_policy(df: pd.DataFrame, compact: pd.DataFrame = None, horizon: int = 10,
+                        model_type: str = 'ARIMA', rtol: float = 1e-3, **backtest_kwargs) -> dict:
+    """
+    Check that compact dtypes leave model accuracy unchanged.
+
+    Runs the same rolling-origin backtest on the original and the compacted
+    frame and compares mean MAE/RMSE/MAPE. Returns both sets of metrics and
+    whether every metric agrees within rtol (relative to the original value).
+    """
+    from .backtesting import run_backtest, summarize_backtest
+
+    compact = apply_dtype_policy(df) if compact is None else compact
+    original = summarize_backtest(run_backtest(df, horizon, model_type, **backtest_kwargs)).iloc[0]
+    downcast = summarize_backtest(run_backtest(compact, horizon, model_type, **backtest_kwargs)).iloc[0]
+    metrics = ['MAE', 'RMSE', 'MAPE']
+    within = all(abs(downcast[m] - original[m]) <= rtol * max(abs(original[m]), 1e-12) for m in metrics)
+    return {
+        'original': original[metrics].to_dict(),
+        'compact': downcast[metrics].to_dict(),
+        'within_tolerance': within,
+        'bytes_original': memory_footprint(df),
+        'bytes_compact': memory_footprint(compact),
+    }
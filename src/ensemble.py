@@ -0,0 +1,132 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from .backtesting import run_backtest
+from .forecasting import DEFAULT_ARIMA_ORDER, run_forecast
+from .regression_forecast import default_regressors, run_regressor_model
+
+DEFAULT_MEMBERS = ("ARIMA", "PROPHET") + tuple(default_regressors())
+
+# Prophet's Stan sampler and the sklearn/BLAS fits release the GIL, so threads are enough;
+# statsmodels' ARIMA likelihood loop is Python-bound and gets its own process.
+MEMBER_EXECUTORS = {"ARIMA": "process", "PROPHET": "thread",
+                    "LinearRegression": "thread", "RandomForest": "thread"}
+
+
+def run_member(df: pd.DataFrame, horizon: int, member: str, order=DEFAULT_ARIMA_ORDER) -> pd.Series:
+    """Forecast with one ensemble member; returns the 'Forecast' series indexed by date."""
+    regressors = default_regressors()
+    if member in regressors:
+        return run_regressor_model(df, horizon, regressors[member])["Forecast"]
+    return run_forecast(df, horizon, member, order=order)["Forecast"]
+
+
+def inverse_rmse_weights(rmse: dict) -> dict:
+    """Normalised 1/RMSE weights; members with a missing or non-positive RMSE get no weight."""
+    inverse = {member: 1.0 / value for member, value in rmse.items()
+               if value is not None and np.isfinite(value) and value > 0}
+    total = sum(inverse.values())
+    return {member: value / total for member, value in inverse.items()} if total else {}
+
+
+def backtest_weights(df: pd.DataFrame, horizon: int, members=DEFAULT_MEMBERS, order=DEFAULT_ARIMA_ORDER,
+                     **backtest_kwargs) -> dict:
+    """Inverse mean out-of-sample RMSE weights from a rolling-origin backtest of each member."""
+    rmse = {}
+    for member in members:
+        results = run_backtest(df, horizon, member, order=order, **backtest_kwargs)
+        rmse[member] = results["RMSE"].mean() if not results.empty else np.nan
+    return inverse_rmse_weights(rmse)
+
+
+def combine_forecasts(forecasts: dict, weights: dict = None) -> pd.DataFrame:
+    """
+    Weighted average of member forecasts aligned on date.
+
+    Weights are renormalised per date over the members that produced a value,
+    so a dropped member shifts its share to the others. Member columns are
+    kept alongside 'Forecast'.
+    """
+    members = pd.DataFrame(forecasts)
+    weights = pd.Series({m: 1.0 if weights is None else weights.get(m, 0.0) for m in members.columns},
+                        dtype=float)
+    present = members.notna().mul(weights, axis=1)
+    combined = members.fillna(0.0).mul(weights, axis=1).sum(axis=1) / present.sum(axis=1)
+    result = members.copy()
+    result.insert(0, "Forecast", combined)
+    result.index.name = "Date"
+    return result
+
+
+def run_ensemble_forecast(df: pd.DataFrame, horizon: int, members=DEFAULT_MEMBERS, weights=None,
+                          timeout: float = 60, order=DEFAULT_ARIMA_ORDER, **backtest_kwargs):
+    """
+    Run several models concurrently and combine their forecasts.
+
+    Parameters:
+    - df: Preprocessed DataFrame with datetime index and 'Close' column
+    - horizon: Number of future days to forecast
+    - members: Model names from DEFAULT_MEMBERS
+    - weights: None for equal weights, a {member: weight} dict, or 'inverse_rmse' to
+      weight by backtest_weights (extra keyword arguments go to run_backtest)
+    - timeout: Seconds to wait for members; any still running then are dropped
+
+    Returns:
+    - forecast_df: 'Forecast' plus one column per member that finished
+    - report: One row per member with status ('ok', 'failed', 'timeout'), seconds, weight and error
+    """
+    members = list(members)
+    unknown = [m for m in members if m not in MEMBER_EXECUTORS]
+    if unknown:
+        raise ValueError(f"Unsupported ensemble members: {unknown}")
+    if isinstance(weights, str):
+        if weights != "inverse_rmse":
+            raise ValueError(f"Unsupported weighting: {weights}")
+        weights = backtest_weights(df, horizon, members, order=order, **backtest_kwargs)
+
+    kinds = {kind: [m for m in members if MEMBER_EXECUTORS[m] == kind] for kind in ("thread", "process")}
+    executors = {
+        "thread": ThreadPoolExecutor(max_workers=len(kinds["thread"])) if kinds["thread"] else None,
+        "process": ProcessPoolExecutor(max_workers=len(kinds["process"])) if kinds["process"] else None,
+    }
+    started = time.perf_counter()
+    futures = {}
+    for kind, names in kinds.items():
+        for member in names:
+            futures[executors[kind].submit(run_member, df, horizon, member, order)] = member
+
+    report = {m: {"member": m, "status": "timeout", "seconds": np.nan, "error": None} for m in members}
+    forecasts = {}
+    pending = set(futures)
+    deadline = started + timeout
+    while pending:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            member = futures[future]
+            report[member]["seconds"] = time.perf_counter() - started
+            try:
+                forecasts[member] = future.result()
+                report[member]["status"] = "ok"
+            except Exception as e:
+                report[member].update({"status": "failed", "error": f"{type(e).__name__}: {e}"})
+
+    # Do not wait for stragglers: their results are discarded once the deadline has passed
+    for executor in executors.values():
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    weights = {m: 1.0 if weights is None else weights.get(m, 0.0) for m in forecasts}
+    total = sum(weights.values())
+    if not total:
+        raise RuntimeError("No weighted ensemble member finished within the timeout.")
+    weights = {m: w / total for m, w in weights.items()}
+    for member, row in report.items():
+        row["weight"] = weights.get(member, 0.0)
+    forecasts = {m: forecasts[m] for m in members if m in forecasts}
+    return combine_forecasts(forecasts, weights), pd.DataFrame(list(report.values()))
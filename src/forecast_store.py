@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    from .storage import atomic_path, atomic_write, file_lock
+except ImportError:
+    from storage import atomic_path, atomic_write, file_lock
+
+DEFAULT_FORECAST_STORE = os.environ.get("FORECAST_STORE", os.path.join("outputs", "forecast_store"))
+
+
+def _order_label(order) -> str:
+    return "none" if order is None else "-".join(str(int(x)) for x in order)
+
+
+class ForecastStore:
+    """
+    Precomputed forecasts on disk, written by batch runs and read by the dashboard.
+
+    Layout: <root>/<ticker>/<MODEL>_<p-d-q>_h<horizon>.parquet plus a per-ticker
+    manifest.json recording each entry's data version (content hash of the
+    series it was fitted on), last bar date and creation time. A stored
+    forecast with a longer horizon also serves shorter requests.
+
+    Manifest updates re-read the file under an exclusive lock (manifest.json.lock)
+    and replace it atomically, so concurrent writers in other processes or
+    dashboard sessions never drop each other's entries.
+    """
+
+    def __init__(self, root: str = DEFAULT_FORECAST_STORE):
+        self.root = root
+        self._manifests = {}
+        self._lock = threading.Lock()
+
+    def _ticker_dir(self, ticker):
+        return os.path.join(self.root, str(ticker))
+
+    def _manifest_path(self, ticker):
+        return os.path.join(self._ticker_dir(ticker), "manifest.json")
+
+    def _read_manifest(self, path) -> dict:
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _load_manifest(self, ticker) -> dict:
+        path = self._manifest_path(ticker)
+        if not os.path.exists(path):
+            return {}
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached = self._manifests.get(ticker)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        manifest = self._read_manifest(path)
+        with self._lock:
+            self._manifests[ticker] = (mtime, manifest)
+        return manifest
+
+    def _update_manifest(self, ticker, name: str, entry: dict) -> None:
+        """Merge one entry into the on-disk manifest under the ticker's file lock."""
+        path = self._manifest_path(ticker)
+        with file_lock(f"{path}.lock"):
+            manifest = self._read_manifest(path) if os.path.exists(path) else {}
+            manifest[name] = entry
+            atomic_write(path, json.dumps(manifest, indent=4))
+            with self._lock:
+                self._manifests[ticker] = (os.stat(path).st_mtime_ns, manifest)
+
+    def put(self, ticker, model_type: str, order, horizon: int, forecast_df: pd.DataFrame,
+            data_version: str, last_bar_date) -> str:
+        """Store a forecast and record its metadata; returns the forecast file path."""
+        model_type = model_type.upper()
+        order = order if model_type == "ARIMA" else None
+        name = f"{model_type}_{_order_label(order)}_h{int(horizon)}"
+        path = os.path.join(self._ticker_dir(ticker), f"{name}.parquet")
+        # Sessions missing on the same key may write it concurrently; each gets its own temp file
+        with atomic_path(path) as tmp_path:
+            forecast_df.to_parquet(tmp_path)
+
+        self._update_manifest(ticker, name, {
+            "model": model_type,
+            "order": None if order is None else list(order),
+            "horizon": int(horizon),
+            "data_version": data_version,
+            "last_bar_date": pd.Timestamp(last_bar_date).isoformat(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "file": os.path.basename(path),
+        })
+        return path
+
+    def get(self, ticker, model_type: str, order, horizon: int, data_version: str = None,
+            latest_bar_date=None, max_age_hours: float = None):
+        """
+        Return a stored forecast of at least `horizon` rows, cut to `horizon`, or None on a miss.
+
+        An entry is a miss when its data_version differs from the given one,
+        when it was fitted before latest_bar_date (stale), or when it is
+        older than max_age_hours.
+        """
+        model_type = model_type.upper()
+        order = list(order) if model_type == "ARIMA" and order is not None else None
+        candidates = []
+        for entry in self._load_manifest(ticker).values():
+            if entry["model"] != model_type or entry["order"] != order or entry["horizon"] < horizon:
+                continue
+            if data_version is not None and entry["data_version"] != data_version:
+                continue
+            if latest_bar_date is not None and pd.Timestamp(entry["last_bar_date"]) < pd.Timestamp(latest_bar_date):
+                continue
+            if max_age_hours is not None:
+                age = datetime.now() - datetime.fromisoformat(entry["created_at"])
+                if age.total_seconds() > max_age_hours * 3600:
+                    continue
+            candidates.append(entry)
+        if not candidates:
+            return None
+        entry = min(candidates, key=lambda e: e["horizon"])
+        path = os.path.join(self._ticker_dir(ticker), entry["file"])
+        if not os.path.exists(path):
+            return None
+        return pd.read_parquet(path).head(horizon)
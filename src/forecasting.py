@@ -1,30 +1,299 @@
+import hashlib
+import importlib
+import logging
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
 import pandas as pd
-from .arima import run_arima_model
-from .Prophet import run_prophet_model
+from .forecast_store import ForecastStore
+from .instrumentation import configure as configure_instrumentation, current_config
+from .panel_store import as_frame
+
+DEFAULT_ARIMA_ORDER = (5, 1, 0)
+
+
+def series_fingerprint(series: pd.Series) -> str:
+    """Content hash of a series (values and index) used as part of the model cache key."""
+    hashed = pd.util.hash_pandas_object(series, index=True).values
+    return hashlib.sha1(hashed.tobytes()).hexdigest()
+
+
+def _estimate_size(obj) -> int:
+    """Approximate in-memory footprint of a fitted model via its pickled size."""
+    try:
+        return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(obj)
+
+
+class ModelCache:
+    """
+    Thread-safe LRU cache of fitted models.
+
+    Entries are evicted least-recently-used first once either `max_entries`
+    or `max_bytes` (approximate, based on pickled size) is exceeded.
+    """
+
+    def __init__(self, max_entries: int = 16, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key, model) -> None:
+        size = _estimate_size(model)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (model, size)
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+
+MODEL_CACHE = ModelCache()
+
+
+class ModelBackend:
+    """
+    A model family whose implementing module is imported on first use.
+
+    fit(module, df, order, model_dir) and forecast(module, model, df, horizon)
+    adapt the module's functions to the run_forecast interface, so importing
+    this file never pays for statsmodels or prophet until they are needed.
+    """
+
+    def __init__(self, module_name: str, fit, forecast):
+        self.module_name = module_name
+        self._fit = fit
+        self._forecast = forecast
+        self._module = None
+
+    @property
+    def module(self):
+        if self._module is None:
+            self._module = importlib.import_module(f".{self.module_name}", __package__)
+        return self._module
+
+    def fit(self, df: pd.DataFrame, order, model_dir: str = None):
+        return self._fit(self.module, df, order, model_dir)
+
+    def forecast(self, model, df: pd.DataFrame, horizon: int) -> pd.DataFrame:
+        return self._forecast(self.module, model, df, horizon)
+
+
+def _fit_arima(module, df, order, model_dir=None):
+    return module.train_arima(df["Close"], order=order)
+
+
+def _forecast_arima(module, model, df, horizon):
+    return module.forecast_arima_frame(model, df.index[-1], horizon)
+
+
+def _fit_prophet(module, df, order=None, model_dir=None):
+    # Forecasts only use yhat, so interval sampling is skipped
+    if model_dir is None:
+        return module.train_prophet(module.to_prophet_frame(df), uncertainty_samples=0)
+    path = os.path.join(model_dir, f"PROPHET_{series_fingerprint(df['Close'])}.json")
+    if os.path.exists(path):
+        return module.load_prophet_model(path)
+    model = module.train_prophet(module.to_prophet_frame(df), uncertainty_samples=0)
+    module.save_prophet_model(model, path)
+    return model
+
+
+def _forecast_prophet(module, model, df, horizon):
+    return module.forecast_prophet_frame(model, horizon)
+
+
+MODEL_REGISTRY = {
+    "ARIMA": ModelBackend("arima", _fit_arima, _forecast_arima),
+    "PROPHET": ModelBackend("Prophet", _fit_prophet, _forecast_prophet),
+}
 
-def run_forecast(df: pd.DataFrame, horizon: int, model_type: str = "ARIMA") -> pd.DataFrame:
+
+def register_model(name: str, module_name: str, fit, forecast) -> None:
+    """Add a model family to the registry; module_name is relative to this package."""
+    MODEL_REGISTRY[name.upper()] = ModelBackend(module_name, fit, forecast)
+
+
+def get_backend(model_type: str) -> ModelBackend:
+    backend = MODEL_REGISTRY.get(model_type.upper())
+    if backend is None:
+        raise ValueError(f"Unsupported model type: {model_type}")
+    return backend
+
+
+def backend_modules(model_types=None) -> list:
+    """Fully qualified module names behind the given model types (all registered ones by default)."""
+    names = MODEL_REGISTRY if model_types is None else [m.upper() for m in model_types]
+    return [f"{__package__}.{get_backend(name).module_name}" for name in names]
+
+
+def worker_context(model_types=None, extra_modules=()):
+    """
+    Multiprocessing context for forecasting pools.
+
+    Where available this is a forkserver preloaded with the model backends
+    (plus extra_modules, typically the module holding the worker function),
+    so statsmodels/prophet are imported once in the server and every worker
+    forks from it warm instead of importing them again. The preload list only
+    takes effect when the server first starts, and before Python 3.13 the
+    server does not inherit sys.path changes, so run from the project root;
+    modules that fail to preload are simply imported by each worker. Falls
+    back to the platform default where forkserver is unavailable (Windows).
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(backend_modules(model_types) + list(extra_modules))
+    return context
+
+
+def _init_worker(instrumentation_config: dict, log_files: list, log_level: int) -> None:
+    configure_instrumentation(**instrumentation_config)
+    root = logging.getLogger()
+    root.setLevel(log_level)
+    for path, fmt in log_files:
+        handler = logging.FileHandler(path)
+        handler.setFormatter(logging.Formatter(fmt))
+        root.addHandler(handler)
+
+
+def worker_initializer():
+    """
+    (initializer, initargs) for pools using worker_context.
+
+    Forkserver and spawn workers start from a fresh interpreter, so they do not
+    inherit the parent's instrumentation settings or logging handlers; the
+    initializer re-applies the settings and attaches a handler for every log
+    file the root logger writes to, so stage records and log lines from
+    workers land in the same files as the parent's.
+    """
+    root = logging.getLogger()
+    log_files = [(h.baseFilename, h.formatter._fmt if h.formatter else None)
+                 for h in root.handlers if isinstance(h, logging.FileHandler)]
+    return _init_worker, (current_config(), log_files, root.level)
+
+
+def get_fitted_model(df: pd.DataFrame, model_type: str = "ARIMA", order=DEFAULT_ARIMA_ORDER,
+                     cache: ModelCache = MODEL_CACHE, model_dir: str = None):
+    """
+    Return a fitted model for df, reusing a cached fit when the data and parameters match.
+
+    The cache key is the content hash of the 'Close' series plus the model type
+    and (for ARIMA) the order, so the forecast horizon never triggers a refit.
+    With model_dir, Prophet fits are also serialized there under the same hash
+    and loaded instead of refitting, which survives process restarts.
+    """
+    model_type = model_type.upper()
+    backend = get_backend(model_type)
+    key_order = tuple(order) if model_type == "ARIMA" else None
+    if cache is None:
+        return backend.fit(df, key_order, model_dir)
+
+    key = (model_type, key_order, series_fingerprint(df["Close"]))
+    model = cache.get(key)
+    if model is None:
+        model = backend.fit(df, key_order, model_dir)
+        cache.put(key, model)
+    return model
+
+
+def run_forecast(df: pd.DataFrame, horizon: int, model_type: str = "ARIMA",
+                 order=DEFAULT_ARIMA_ORDER, cache: ModelCache = MODEL_CACHE,
+                 model_dir: str = None, ticker: str = None) -> pd.DataFrame:
     """
     Unified forecast interface for Streamlit app.
-    
+
     Parameters:
-    - df: Preprocessed DataFrame with datetime index and 'Close' column
+    - df: Preprocessed DataFrame with datetime index and 'Close' column, or a
+      panel_store.PricePanel together with ticker
     - horizon: Number of future days to forecast
-    - model_type: 'ARIMA' or 'PROPHET'
-    
+    - model_type: 'ARIMA', 'PROPHET' or 'ENSEMBLE' (all models combined, see ensemble.py)
+    - order: ARIMA (p, d, q) order, ignored for Prophet
+    - cache: ModelCache used to reuse fitted models; pass None to always refit
+    - model_dir: Optional directory of serialized Prophet fits to reuse across processes
+
     Returns:
     - forecast_df: DataFrame with future dates and predicted values
     """
-    if model_type.upper() == "ARIMA":
-        forecast_df = run_arima_model(df, horizon)
-    elif model_type.upper() == "PROPHET":
-        forecast_df = run_prophet_model(df, horizon)
-    else:
-        raise ValueError(f"Unsupported model type: {model_type}")
-    
+    df = as_frame(df, ticker)
+    if model_type.upper() == "ENSEMBLE":
+        from .ensemble import run_ensemble_forecast
+
+        forecast_df, _ = run_ensemble_forecast(df, horizon, order=order)
+        return forecast_df
+
+    model = get_fitted_model(df, model_type, order=order, cache=cache, model_dir=model_dir)
+    forecast_df = get_backend(model_type).forecast(model, df, horizon)
+
     # Ensure forecast_df has datetime index and 'Forecast' column
     if not isinstance(forecast_df.index, pd.DatetimeIndex):
         forecast_df.index = pd.to_datetime(forecast_df.index)
     if "Forecast" not in forecast_df.columns:
         raise ValueError("Forecast output must contain a 'Forecast' column.")
-    
+
     return forecast_df
+
+
+def forecast_with_store(df: pd.DataFrame, horizon: int, ticker: str, model_type: str = "ARIMA",
+                        order=DEFAULT_ARIMA_ORDER, store: ForecastStore = None,
+                        cache: ModelCache = MODEL_CACHE):
+    """
+    Serve a precomputed forecast when one matches, otherwise fit live.
+
+    The store is keyed by ticker, model, order and horizon. A stored entry is
+    used only if it was fitted on exactly this data (same content hash) and
+    is not older than the latest bar. Live results are written back so the
+    next request for the same data is served from the store. Returns
+    (forecast_df, source) where source is 'store' or 'live'. df may also be a
+    panel_store.PricePanel, read for ticker.
+    """
+    df = as_frame(df, ticker)
+    if store is None:
+        return run_forecast(df, horizon, model_type, order=order, cache=cache), "live"
+
+    data_version = series_fingerprint(df["Close"])
+    forecast_df = store.get(ticker, model_type, order, horizon,
+                            data_version=data_version, latest_bar_date=df.index[-1])
+    if forecast_df is not None:
+        return forecast_df, "store"
+    forecast_df = run_forecast(df, horizon, model_type, order=order, cache=cache)
+    store.put(ticker, model_type, order, horizon, forecast_df, data_version=data_version,
+              last_bar_date=df.index[-1])
+    return forecast_df, "live"
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import HistGradientBoostingRegressor
+
+try:
+    from .Feature_Engineering import DEFAULT_FEATURE_SPEC, _date_features, build_features
+    from .batch_forecasting import split_by_ticker
+    from .panel_store import as_frame
+except ImportError:
+    from Feature_Engineering import DEFAULT_FEATURE_SPEC, _date_features, build_features
+    from batch_forecasting import split_by_ticker
+    from panel_store import as_frame
+
+TICKER_ID = "ticker_id"
+
+
+def _scaled_columns(columns, column: str) -> list:
+    """Price-level features, divided by the current value so one model fits tickers of any scale."""
+    prefixes = ("lag_", "roll_mean_", "roll_std_", "volatility_", "momentum_")
+    return [c for c in columns if c.startswith(f"{column}_") and c[len(column) + 1:].startswith(prefixes)]
+
+
+def _normalize(features: pd.DataFrame, column: str) -> pd.DataFrame:
+    scaled = _scaled_columns(features.columns, column)
+    out = features.drop(columns=[column])
+    out[scaled] = features[scaled].to_numpy(dtype=float) / features[[column]].to_numpy(dtype=float)
+    return out
+
+
+def _window_features(window: np.ndarray, dates: pd.DatetimeIndex, column: str, spec: dict) -> pd.DataFrame:
+    """
+    Features of the latest bar of every series at once.
+
+    window is (series, values) holding each series' most recent values, oldest
+    first; the columns match the last row of build_features for each series.
+    """
+    features = {column: window[:, -1]}
+    for lag in spec["lags"]:
+        features[f"{column}_lag_{lag}"] = window[:, -1 - lag]
+    stats = {}
+    for w in sorted(set(spec["rolling_windows"]) | set(spec["volatility_windows"]) | set(spec["momentum_windows"])):
+        tail = window[:, -w:]
+        stats[w] = (tail.mean(axis=1), tail.std(axis=1, ddof=1) if w > 1 else np.full(len(window), np.nan))
+    for w in spec["rolling_windows"]:
+        features[f"{column}_roll_mean_{w}"] = stats[w][0]
+        features[f"{column}_roll_std_{w}"] = stats[w][1]
+    if spec["date_features"]:
+        features.update(_date_features(dates))
+    for w in spec["volatility_windows"]:
+        features[f"{column}_volatility_{w}"] = stats[w][1]
+    for w in spec["momentum_windows"]:
+        features[f"{column}_momentum_{w}"] = window[:, -1] - stats[w][0]
+    return pd.DataFrame(features)
+
+
+class GlobalForecaster:
+    """
+    One regression model shared by every ticker.
+
+    Features from build_features are computed per ticker, scaled by the
+    current value and stacked into one long matrix with a categorical ticker
+    id; the target is the next bar's relative change. A single fit therefore
+    replaces one fit per series, and forecasting runs one batched predict per
+    horizon step for all tickers, rolling the lag/rolling windows forward as
+    NumPy arrays. Future dates are consecutive calendar days, as in
+    run_arima_model.
+
+    The default HistGradientBoostingRegressor handles the categorical ticker
+    id natively; for models that do not, pass use_ticker_id=False or wrap the
+    model in a pipeline that encodes it.
+    """
+
+    def __init__(self, model=None, column: str = "Close", spec: dict = None, use_ticker_id: bool = True):
+        self.model = model if model is not None else HistGradientBoostingRegressor(random_state=42)
+        self.column = column
+        self.spec = {**DEFAULT_FEATURE_SPEC, **(spec or {})}
+        self.use_ticker_id = use_ticker_id
+        self.size = max(list(self.spec["lags"]) + self.spec["rolling_windows"]
+                        + self.spec["volatility_windows"] + self.spec["momentum_windows"])
+        self.tickers = None
+        self.fitted_ = None
+
+    def _design(self, features: pd.DataFrame, tickers) -> pd.DataFrame:
+        X = _normalize(features, self.column)
+        if self.use_ticker_id:
+            X[TICKER_ID] = pd.Categorical(tickers, categories=self.tickers)
+        return X
+
+    def stack(self, frames: dict):
+        """Long feature matrix and next-bar relative-change target over all tickers."""
+        parts, targets, labels = [], [], []
+        for ticker, df in frames.items():
+            features = build_features(df[[self.column]], self.column, self.spec)
+            values = features[self.column].to_numpy(dtype=float)
+            target = np.append(values[1:] / values[:-1] - 1, np.nan)
+            keep = features.notna().all(axis=1).to_numpy() & ~np.isnan(target)
+            parts.append(features[keep])
+            targets.append(target[keep])
+            labels.append(np.full(keep.sum(), str(ticker), dtype=object))
+        features = pd.concat(parts)
+        return self._design(features, np.concatenate(labels)), np.concatenate(targets)
+
+    def fit(self, data, ticker_col: str = "Ticker"):
+        """Fit the shared model on every ticker in data ({ticker: df}, long format or a PricePanel)."""
+        frames = {t: as_frame(df, t) for t, df in split_by_ticker(data, ticker_col).items()}
+        self.tickers = sorted(str(t) for t in frames)
+        X, y = self.stack(frames)
+        self.fitted_ = clone(self.model).fit(X, y)
+        return self
+
+    def forecast(self, data, horizon: int, ticker_col: str = "Ticker"):
+        """
+        Forecast `horizon` days for every ticker in data.
+
+        Returns:
+        - forecast_df: Forecasts indexed by date with a ticker column, like run_batch_forecast
+        - failures: {ticker: message} for series shorter than the feature windows
+        """
+        if self.fitted_ is None:
+            raise ValueError("GlobalForecaster must be fitted before forecasting.")
+        frames = {t: as_frame(df, t) for t, df in split_by_ticker(data, ticker_col).items()}
+        failures = {t: f"needs at least {self.size + 1} rows" for t, df in frames.items() if len(df) <= self.size}
+        tickers = [t for t in frames if t not in failures]
+        if not tickers:
+            return pd.DataFrame(columns=["Forecast", ticker_col], index=pd.DatetimeIndex([], name="Date")), failures
+
+        window = np.stack([frames[t][self.column].to_numpy(dtype=float)[-(self.size + 1):] for t in tickers])
+        dates = pd.DatetimeIndex([frames[t].index[-1] for t in tickers])
+        labels = np.array([str(t) for t in tickers], dtype=object)
+        predictions = np.empty((len(tickers), horizon))
+        for step in range(horizon):
+            X = self._design(_window_features(window, dates, self.column, self.spec), labels)
+            change = self.fitted_.predict(X)
+            predictions[:, step] = window[:, -1] * (1 + change)
+            window = np.concatenate([window[:, 1:], predictions[:, step:step + 1]], axis=1)
+            dates = dates + pd.Timedelta(days=1)
+
+        last_dates = pd.DatetimeIndex([frames[t].index[-1] for t in tickers])
+        forecast_dates = last_dates.values[:, None] + np.arange(1, horizon + 1) * np.timedelta64(1, "D")
+        forecast_df = pd.DataFrame({
+            "Forecast": predictions.ravel(),
+            ticker_col: np.repeat(tickers, horizon),
+        }, index=pd.DatetimeIndex(forecast_dates.ravel(), name="Date"))
+        return forecast_df, failures
+
+
+def run_global_forecast(data, horizon: int, model=None, ticker_col: str = "Ticker"):
+    """Fit one GlobalForecaster on all tickers in data and forecast each; returns (forecast_df, failures)."""
+    return GlobalForecaster(model).fit(data, ticker_col).forecast(data, horizon, ticker_col)
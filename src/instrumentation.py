@@ -0,0 +1,128 @@
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_config = {
+    "metrics_path": None,
+    "profile_dir": None,
+    "trace_memory": False,
+}
+_write_lock = threading.Lock()
+_local = threading.local()
+
+
+def configure(metrics_path: str = None, profile_dir: str = None, trace_memory: bool = False) -> None:
+    """
+    Enable stage instrumentation output.
+
+    Parameters:
+    - metrics_path: JSON-lines file that receives one record per stage; None disables writing
+    - profile_dir: If set, each stage is run under cProfile and dumped to <profile_dir>/<stage>.prof
+    - trace_memory: Track Python allocations with tracemalloc (adds noticeable overhead)
+    """
+    _config.update(metrics_path=metrics_path, profile_dir=profile_dir, trace_memory=trace_memory)
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def current_config() -> dict:
+    """The active configure() arguments, e.g. to re-apply them in a worker process."""
+    return dict(_config)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _emit(record: dict) -> None:
+    path = _config["metrics_path"]
+    if path is None:
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with _write_lock, open(path, "a") as f:
+        f.write(json.dumps(record, default=str) + "\n")
+
+
+@contextmanager
+def stage(name: str, ticker: str = None, rows: int = None, **extra):
+    """
+    Time a pipeline stage and emit a structured record for it.
+
+    Yields the record dict so the body can fill in fields known only later,
+    e.g. `rec["rows"] = len(df)`. Records include wall and CPU seconds, peak
+    RSS, the tracemalloc delta/peak when tracing is on, and whether the stage
+    raised. Exceptions propagate unchanged.
+    """
+    record = {"stage": name, "ticker": ticker, "rows": rows, **extra}
+    # Only the outermost stage on a thread is profiled; cProfile cannot nest
+    profiler = None
+    if _config["profile_dir"] and not getattr(_local, "profiling", False):
+        profiler = cProfile.Profile()
+        _local.profiling = True
+    tracing = _config["trace_memory"] and tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+        mem_before = tracemalloc.get_traced_memory()[0]
+    rss_before = peak_rss_mb()
+    started_at = datetime.now().isoformat(timespec="milliseconds")
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield record
+        record["status"] = "ok"
+    except BaseException as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _local.profiling = False
+        record["wall_s"] = time.perf_counter() - wall_start
+        record["cpu_s"] = time.process_time() - cpu_start
+        record["started_at"] = started_at
+        rss_after = peak_rss_mb()
+        record["peak_rss_mb"] = rss_after
+        record["peak_rss_growth_mb"] = None if rss_before is None else rss_after - rss_before
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            record["tracemalloc_delta_mb"] = (current - mem_before) / (1024 * 1024)
+            record["tracemalloc_peak_mb"] = peak / (1024 * 1024)
+        if profiler is not None:
+            os.makedirs(_config["profile_dir"], exist_ok=True)
+            label = f"{name}_{ticker}" if ticker else name
+            profile_path = os.path.join(_config["profile_dir"], f"{label}.prof")
+            profiler.dump_stats(profile_path)
+            record["profile"] = profile_path
+        _emit(record)
+
+
+def instrument(name: str = None):
+    """Decorator form of stage(); the stage name defaults to the function name."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,231 @@
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+METRICS = ("MAE", "RMSE", "MAPE", "sMAPE", "DirAcc")
+
+
+def score_arrays(actual, predicted, last_actual=None, axis: int = -1) -> dict:
+    """
+    Forecast metrics over one axis of equally shaped arrays, in a single vectorized pass.
+
+    Parameters:
+    - actual, predicted: Arrays of any shape, e.g. (tickers, models, horizon); NaN marks
+      steps with no actual or no forecast and is left out of every metric
+    - last_actual: Last observed value before each forecast, shaped like actual without the
+      scored axis; used as the reference for the first step's direction
+    - axis: Axis to reduce over (the horizon steps by default)
+
+    Returns:
+    - {metric: array}: MAE, RMSE, MAPE and sMAPE (both in percent) and DirAcc, the share of
+      steps whose predicted move from the previous actual has the same sign as the actual move
+    """
+    actual = np.moveaxis(np.asarray(actual, dtype=float), axis, -1)
+    predicted = np.moveaxis(np.asarray(predicted, dtype=float), axis, -1)
+    errors = predicted - actual
+    valid = ~np.isnan(errors)
+    count = valid.sum(axis=-1)
+    abs_errors = np.where(valid, np.abs(errors), 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ape = np.where(valid & (actual != 0), abs_errors / np.abs(actual), np.nan)
+        denom = np.abs(actual) + np.abs(predicted)
+        sape = np.where(valid & (denom != 0), 2 * abs_errors / denom, np.nan)
+        mae = abs_errors.sum(axis=-1) / count
+        rmse = np.sqrt(np.where(valid, errors ** 2, 0.0).sum(axis=-1) / count)
+
+        if last_actual is None:
+            last_actual = np.full(actual.shape[:-1], np.nan)
+        previous = np.concatenate([np.asarray(last_actual, dtype=float)[..., None], actual[..., :-1]], axis=-1)
+        moves = valid & ~np.isnan(previous)
+        hits = np.sign(predicted - previous) == np.sign(actual - previous)
+        dir_acc = np.where(moves, hits, False).sum(axis=-1) / moves.sum(axis=-1)
+
+        mape = _nan_mean(ape) * 100
+        smape = _nan_mean(sape) * 100
+    return {"MAE": mae, "RMSE": rmse, "MAPE": mape, "sMAPE": smape, "DirAcc": dir_acc}
+
+
+def _nan_mean(values):
+    """Mean over the last axis ignoring NaN; NaN (without a warning) where nothing is left."""
+    present = ~np.isnan(values)
+    return np.where(present, values, 0.0).sum(axis=-1) / present.sum(axis=-1)
+
+
+def _wide_actuals(actuals, ticker_col: str, value_col: str) -> pd.DataFrame:
+    """Actuals as a sorted dates x tickers frame, from a Series, a wide frame or a long frame."""
+    if isinstance(actuals, pd.Series):
+        actuals = actuals.to_frame(actuals.name if actuals.name is not None else value_col)
+    elif ticker_col in actuals.columns:
+        actuals = actuals.pivot_table(index=actuals.index, columns=ticker_col, values=value_col,
+                                      observed=True)
+    return actuals.sort_index()
+
+
+def align_forecasts(actuals, forecasts: pd.DataFrame, ticker_col: str = "Ticker", model_col: str = "model",
+                    value_col: str = "Close", forecast_col: str = "Forecast"):
+    """
+    Align long-format forecasts to actuals by date into (tickers, models, horizon) arrays.
+
+    Parameters:
+    - actuals: Series for a single ticker, a dates x tickers frame, or a long frame with
+      ticker_col and value_col
+    - forecasts: Frame indexed by forecast date with forecast_col and optional ticker_col and
+      model_col columns (e.g. run_batch_forecast output); step h of each (ticker, model)
+      series is its h-th date
+    - Forecast dates with no actual (weekends, the future) become NaN and are not scored.
+
+    Returns:
+    - tickers, models: Labels of the first two axes
+    - actual, predicted: Arrays shaped (tickers, models, horizon), NaN-padded
+    - last_actual: (tickers, models) last actual before each series' first forecast date
+    """
+    wide = _wide_actuals(actuals, ticker_col, value_col)
+    forecasts = forecasts.sort_index(kind="stable")
+    dates = pd.DatetimeIndex(forecasts.index).values
+    # factorize hashes labels instead of sorting every row, which matters for long inputs
+    if ticker_col in forecasts.columns:
+        ticker_codes, tickers = pd.factorize(forecasts[ticker_col].astype(str), sort=True)
+    else:
+        ticker_codes, tickers = np.zeros(len(forecasts), dtype=np.intp), pd.Index([str(wide.columns[0])])
+    if model_col in forecasts.columns:
+        model_codes, models = pd.factorize(forecasts[model_col].astype(str), sort=True)
+    else:
+        model_codes, models = np.zeros(len(forecasts), dtype=np.intp), pd.Index([forecast_col])
+    tickers, models = np.asarray(tickers), np.asarray(models)
+    series_codes = ticker_codes * len(models) + model_codes
+    steps = pd.Series(series_codes).groupby(series_codes).cumcount().to_numpy()
+    horizon = int(steps.max()) + 1 if len(steps) else 0
+
+    columns = pd.Index(wide.columns.astype(str))
+    column_pos = columns.get_indexer(tickers)
+    values = wide.to_numpy(dtype=float)
+    actual_dates = pd.DatetimeIndex(wide.index).values
+    row_pos = np.searchsorted(actual_dates, dates)
+    clipped = np.minimum(row_pos, len(actual_dates) - 1)
+    col_pos = column_pos[ticker_codes]
+    found = (row_pos < len(actual_dates)) & (actual_dates[clipped] == dates) & (col_pos >= 0)
+
+    shape = (len(tickers), len(models), horizon)
+    actual = np.full(shape, np.nan)
+    predicted = np.full(shape, np.nan)
+    predicted[ticker_codes, model_codes, steps] = forecasts[forecast_col].to_numpy(dtype=float)
+    actual[ticker_codes[found], model_codes[found], steps[found]] = values[clipped[found], col_pos[found]]
+
+    last_actual = np.full(shape[:2], np.nan)
+    first = steps == 0
+    before = row_pos[first] - 1
+    has_before = (before >= 0) & (col_pos[first] >= 0)
+    last_actual[ticker_codes[first][has_before], model_codes[first][has_before]] = \
+        values[before[has_before], col_pos[first][has_before]]
+    return tickers, models, actual, predicted, last_actual
+
+
+def score_forecasts(actuals, forecasts: pd.DataFrame, ticker_col: str = "Ticker", model_col: str = "model",
+                    value_col: str = "Close", forecast_col: str = "Forecast") -> pd.DataFrame:
+    """
+    Score every (ticker, model) forecast series against actuals aligned by date.
+    Returns one row per (ticker, model) with METRICS columns and the number of scored steps.
+    """
+    tickers, models, actual, predicted, last_actual = align_forecasts(
+        actuals, forecasts, ticker_col, model_col, value_col, forecast_col)
+    scores = score_arrays(actual, predicted, last_actual)
+    index = pd.MultiIndex.from_product([tickers, models], names=[ticker_col, model_col])
+    result = pd.DataFrame({name: scores[name].ravel() for name in METRICS}, index=index)
+    result["steps"] = (~np.isnan(predicted - actual)).sum(axis=-1).ravel()
+    return result
+
+
+def score_series(actual: pd.Series, predicted: pd.Series) -> dict:
+    """METRICS for one forecast series against actuals, aligned on their DatetimeIndex."""
+    scores = score_forecasts(actual.rename("Close"), predicted.rename("Forecast").to_frame())
+    return {name: float(scores[name].iloc[0]) for name in METRICS}
+
+
+def _fit_fold(model, X, y, train, test):
+    """Fit a fresh copy of model on one split; X and y may be read-only memmaps shared between workers."""
+    from sklearn.base import clone
+
+    tic = time.perf_counter()
+    fitted = clone(model).fit(X[train], y[train])
+    fit_seconds = time.perf_counter() - tic
+    tic = time.perf_counter()
+    predicted = fitted.predict(X[test])
+    return predicted, fit_seconds, time.perf_counter() - tic
+
+
+def cross_validate_models(models: dict, X, y, n_splits: int = 5, n_jobs: int = -1) -> pd.DataFrame:
+    """
+    Walk-forward (TimeSeriesSplit) cross-validation of sklearn regressors.
+
+    Every (model, fold) pair is an independent joblib task, so n_jobs=-1 keeps
+    all cores busy. X and y are dumped once to a temporary file and opened as
+    read-only memmaps, so workers share the pages instead of each receiving a
+    pickled copy of the feature matrix. All predictions are scored together
+    in one score_arrays call.
+
+    Returns:
+    - One row per (model, fold) with train_size, fit_seconds, predict_seconds and METRICS
+    """
+    import joblib
+    from sklearn.model_selection import TimeSeriesSplit
+
+    X = np.ascontiguousarray(X, dtype=float)
+    y = np.ascontiguousarray(y, dtype=float)
+    folds = list(TimeSeriesSplit(n_splits=n_splits).split(X))
+    test_size = min(len(test) for _, test in folds)
+    folds = [(train, test[:test_size]) for train, test in folds]
+
+    tmp_dir = tempfile.mkdtemp(prefix="cv_memmap_")
+    try:
+        joblib.dump(X, os.path.join(tmp_dir, "X.joblib"))
+        joblib.dump(y, os.path.join(tmp_dir, "y.joblib"))
+        X_shared = joblib.load(os.path.join(tmp_dir, "X.joblib"), mmap_mode="r")
+        y_shared = joblib.load(os.path.join(tmp_dir, "y.joblib"), mmap_mode="r")
+        outputs = joblib.Parallel(n_jobs=n_jobs)(
+            joblib.delayed(_fit_fold)(model, X_shared, y_shared, train, test)
+            for model in models.values() for train, test in folds)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    shape = (len(models), len(folds))
+    predicted = np.stack([out[0] for out in outputs]).reshape(shape + (test_size,))
+    actual = np.stack([y[test] for _ in models for _, test in folds]).reshape(predicted.shape)
+    last_actual = np.array([y[train[-1]] for _ in models for train, _ in folds]).reshape(shape)
+    scores = score_arrays(actual, predicted, last_actual)
+
+    results = pd.DataFrame({
+        "model": np.repeat(list(models), len(folds)),
+        "fold": np.tile(np.arange(len(folds)), len(models)),
+        "train_size": np.tile([len(train) for train, _ in folds], len(models)),
+        "fit_seconds": [out[1] for out in outputs],
+        "predict_seconds": [out[2] for out in outputs],
+    })
+    for name in METRICS:
+        results[name] = scores[name].ravel()
+    return results
+
+
+def compare_models(models: dict, X, y, n_splits: int = 5, n_jobs: int = -1) -> dict:
+    """
+    Compare sklearn regressors with walk-forward cross-validation (see cross_validate_models).
+
+    Returns:
+    - {name: {'RMSE': mean fold RMSE, 'STD': std of fold RMSE, 'fit_seconds': mean per fold,
+      plus mean MAE, MAPE, sMAPE and DirAcc}}
+    """
+    return summarize_folds(cross_validate_models(models, X, y, n_splits=n_splits, n_jobs=n_jobs))
+
+
+def summarize_folds(folds: pd.DataFrame) -> dict:
+    """Per-model summary of cross_validate_models output, in the compare_models format."""
+    results = {}
+    for name, group in folds.groupby("model", sort=False):
+        results[name] = {"RMSE": float(group["RMSE"].mean()), "STD": float(group["RMSE"].std(ddof=0)),
+                         "fit_seconds": float(group["fit_seconds"].mean())}
+        results[name].update({metric: float(group[metric].mean()) for metric in METRICS if metric != "RMSE"})
+    return results
@@ -0,0 +1,167 @@
+import json
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .arima import train_arima
+    from .storage import atomic_write, file_lock
+except ImportError:
+    from arima import train_arima
+    from storage import atomic_write, file_lock
+
+DEFAULT_ORDER_STORE = os.path.join("outputs", "metrics", "arima_orders.json")
+
+
+def _score_order(values, order, criterion):
+    """Fit one candidate order and return its information criterion, or None if it failed."""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model_fit = train_arima(pd.Series(values), order=order)
+        score = getattr(model_fit, criterion)
+        converged = model_fit.mle_retvals.get("converged", True) if model_fit.mle_retvals else True
+        if not converged or not np.isfinite(score):
+            return None
+        return float(score)
+    except Exception:
+        return None
+
+
+def choose_d(values, max_d: int = 2, alpha: float = 0.05) -> int:
+    """Smallest differencing order whose series passes an ADF unit-root test."""
+    from statsmodels.tsa.stattools import adfuller
+
+    series = np.asarray(values, dtype=float)
+    for d in range(max_d + 1):
+        if len(series) < 10:
+            return d
+        if adfuller(series, autolag="AIC")[1] < alpha:
+            return d
+        series = np.diff(series)
+    return max_d
+
+
+def _neighbours(order, max_p, max_q):
+    p, d, q = order
+    for dp, dq in ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1), (1, -1), (-1, 1)):
+        if 0 <= p + dp <= max_p and 0 <= q + dq <= max_q:
+            yield (p + dp, d, q + dq)
+
+
+def _has_failed_parent(order, failed):
+    """Prune an order when a lower-order neighbour on the same axis already diverged."""
+    p, d, q = order
+    return (p - 1, d, q) in failed or (p, d, q - 1) in failed
+
+
+def select_order(series, d: int = 1, max_p: int = 5, max_q: int = 5, criterion: str = "aic",
+                 max_workers: int = 1, max_rounds: int = 20):
+    """
+    Stepwise (p, d, q) search minimising AIC or BIC.
+
+    Starts from a small set of orders and repeatedly scores the unvisited
+    neighbours of the current best in parallel, stopping when no neighbour
+    improves on it. Orders whose lower-order neighbours failed to converge are
+    skipped. Pass d=None to pick d with an ADF test.
+
+    Returns (order, score); raises ValueError if no candidate could be fitted.
+    """
+    if criterion not in ("aic", "bic"):
+        raise ValueError(f"Unsupported criterion: {criterion}")
+    values = np.asarray(series, dtype=float)
+    if d is None:
+        d = choose_d(values)
+
+    scores, failed = {}, set()
+    candidates = [(min(2, max_p), d, min(2, max_q)), (0, d, 0), (min(1, max_p), d, 0), (0, d, min(1, max_q))]
+    executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+    try:
+        for _ in range(max_rounds):
+            candidates = [o for o in dict.fromkeys(candidates)
+                          if o not in scores and o not in failed and not _has_failed_parent(o, failed)]
+            if not candidates:
+                break
+            if executor is None:
+                results = [_score_order(values, o, criterion) for o in candidates]
+            else:
+                results = list(executor.map(_score_order, [values] * len(candidates), candidates,
+                                            [criterion] * len(candidates)))
+            best_before = min(scores.values()) if scores else np.inf
+            for order, score in zip(candidates, results):
+                if score is None:
+                    failed.add(order)
+                else:
+                    scores[order] = score
+            if not scores:
+                break
+            best = min(scores, key=scores.get)
+            if scores[best] >= best_before:
+                break
+            candidates = list(_neighbours(best, max_p, max_q))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if not scores:
+        raise ValueError("No ARIMA order could be fitted to the series.")
+    best = min(scores, key=scores.get)
+    return best, scores[best]
+
+
+def load_order_store(path: str = DEFAULT_ORDER_STORE) -> dict:
+    """Read persisted per-ticker orders ({ticker: {"order": [p, d, q], ...}})."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_order_store(store: dict, path: str = DEFAULT_ORDER_STORE) -> None:
+    """Write per-ticker orders atomically so a crashed run never leaves a truncated file."""
+    atomic_write(path, json.dumps(store, indent=4))
+
+
+def update_order_store(records: dict, path: str = DEFAULT_ORDER_STORE) -> dict:
+    """
+    Merge {ticker: record} into the persisted store and return the merged store.
+
+    The store is re-read and written under an exclusive lock (<path>.lock), so
+    concurrent writers in other threads or processes never drop each other's entries.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with file_lock(f"{path}.lock"):
+        store = load_order_store(path)
+        store.update(records)
+        save_order_store(store, path)
+    return store
+
+
+def order_record(order, score, criterion, nobs) -> dict:
+    return {
+        "order": list(order),
+        "criterion": criterion,
+        "score": score,
+        "nobs": int(nobs),
+        "selected_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def get_order(ticker: str, series, store_path: str = DEFAULT_ORDER_STORE, refresh: bool = False,
+              **search_kwargs):
+    """
+    Return the persisted order for ticker, running select_order and saving the result on a miss.
+    """
+    store = load_order_store(store_path)
+    if not refresh and ticker in store:
+        return tuple(store[ticker]["order"])
+    order, score = select_order(series, **search_kwargs)
+    update_order_store({ticker: order_record(order, score, search_kwargs.get("criterion", "aic"), len(series))},
+                       store_path)
+    return order
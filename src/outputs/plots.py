@@ -1,12 +1,27 @@
-import matplotlib.pyplot as plt
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Figures are built with the object-oriented API on an Agg canvas rather than pyplot,
+# so they are never registered with a GUI backend and are freed as soon as they go
+# out of scope. This also makes it safe to render from worker threads.
+
+
+def _new_figure(figsize=None):
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
 
 def plot_forecast(df_actual: pd.DataFrame, df_forecast: pd.DataFrame):
     """
     Plots actual vs forecasted values.
     Assumes both DataFrames have datetime index and 'Close' / 'Forecast' columns.
     """
-    fig, ax = plt.subplots(figsize=(10, 5))
+    fig, ax = _new_figure(figsize=(10, 5))
     if "Close" in df_actual.columns:
         ax.plot(df_actual.index, df_actual["Close"], label="Actual", color="blue")
     ax.plot(df_forecast.index, df_forecast["Forecast"], label="Forecast", color="orange")
@@ -15,3 +30,82 @@ def plot_forecast(df_actual: pd.DataFrame, df_forecast: pd.DataFrame):
     ax.set_ylabel("Price")
     ax.legend()
     return fig
+
+
+def plot_arima_forecast(forecast: pd.Series):
+    """Plot a forecast series returned by arima.forecast_arima."""
+    fig, ax = _new_figure()
+    ax.plot(forecast, label="ARIMA Forecast", color="orange")
+    ax.set_title("ARIMA Forecast")
+    ax.set_xlabel("Steps")
+    ax.set_ylabel("Predicted Value")
+    ax.legend()
+    return fig
+
+
+def plot_prophet_forecast(model, forecast: pd.DataFrame):
+    """Plot a fitted Prophet model with the frame returned by Prophet.forecast_prophet."""
+    fig, ax = _new_figure(figsize=(10, 6))
+    model.plot(forecast, ax=ax)
+    ax.set_title("Prophet Forecast")
+    return fig
+
+
+def plot_residuals(residuals, title: str = "Residuals"):
+    fig, ax = _new_figure()
+    ax.plot(residuals)
+    ax.set_title(title)
+    return fig
+
+
+def save_figure(fig, path: str) -> str:
+    """Write a figure to disk and release it, including figures created through pyplot."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    try:
+        fig.savefig(path)
+    finally:
+        if fig.canvas.manager is not None:
+            import matplotlib.pyplot as plt
+            plt.close(fig)
+        fig.clear()
+    return path
+
+
+def render_plot(plot_func, args, path: str) -> str:
+    """Build a figure with plot_func(*args) and save it; the unit of work for render_plots."""
+    return save_figure(plot_func(*args), path)
+
+
+def render_plots(jobs, max_workers: int = 4, use_processes: bool = False):
+    """
+    Render many figures off the calling thread.
+
+    Parameters:
+    - jobs: Iterable of (plot_func, args, path) tuples; nothing is drawn until this is called
+    - max_workers: Thread (or process) count; 0 or 1 renders inline
+    - use_processes: Use a process pool for CPU-heavy batches (plot_func and args must pickle)
+
+    Returns:
+    - (saved_paths, failures) where failures maps path to error message
+    """
+    jobs = list(jobs)
+    saved, failures = [], {}
+    if max_workers <= 1:
+        for plot_func, args, path in jobs:
+            try:
+                saved.append(render_plot(plot_func, args, path))
+            except Exception as e:
+                failures[path] = f"{type(e).__name__}: {e}"
+        return saved, failures
+
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_cls(max_workers=max_workers) as executor:
+        futures = {executor.submit(render_plot, plot_func, args, path): path for plot_func, args, path in jobs}
+        for future, path in futures.items():
+            try:
+                saved.append(future.result())
+            except Exception as e:
+                failures[path] = f"{type(e).__name__}: {e}"
+    return saved, failures
@@ -0,0 +1,134 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .storage import atomic_path, atomic_write
+except ImportError:
+    from storage import atomic_path, atomic_write
+
+PRICE_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+VALUES_FILE = "values.npy"
+INDEX_FILE = "index.json"
+
+
+def build_panel(data, path: str, fields=None, ticker_col: str = "Ticker", dtype=np.float64) -> "PricePanel":
+    """
+    Write cleaned per-ticker frames (preprocessing.clean_data output) as a dense on-disk panel.
+
+    Parameters:
+    - data: {ticker: DataFrame} mapping or long-format frame with a ticker column,
+      each indexed by date
+    - path: Directory for values.npy (dates x tickers x fields) and the index.json sidecar
+    - fields: Columns to store; defaults to the PRICE_FIELDS every frame has
+    - dtype: Stored dtype (float32 halves the size, see dtype_policy)
+
+    Dates a ticker has no bar for are stored as NaN. Returns the opened PricePanel.
+    """
+    if isinstance(data, pd.DataFrame):
+        frames = {ticker: group.drop(columns=[ticker_col])
+                  for ticker, group in data.groupby(ticker_col, sort=False, observed=True)}
+    else:
+        frames = dict(data)
+    if not frames:
+        raise ValueError("No tickers to build a panel from.")
+    if fields is None:
+        fields = [f for f in PRICE_FIELDS if all(f in df.columns for df in frames.values())]
+    tickers = sorted(str(t) for t in frames)
+    by_name = {str(t): df for t, df in frames.items()}
+    dates = pd.DatetimeIndex(sorted(set().union(*(pd.DatetimeIndex(df.index) for df in frames.values()))))
+
+    with atomic_path(os.path.join(path, VALUES_FILE)) as tmp_path:
+        values = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype,
+                                           shape=(len(dates), len(tickers), len(fields)))
+        values[:] = np.nan
+        for j, ticker in enumerate(tickers):
+            df = by_name[ticker]
+            df = df[~df.index.duplicated(keep="last")]
+            rows = dates.get_indexer(pd.DatetimeIndex(df.index))
+            values[rows, j, :] = df[list(fields)].to_numpy(dtype=dtype)
+        values.flush()
+        del values
+
+    atomic_write(os.path.join(path, INDEX_FILE), json.dumps({
+        "dates": [d.isoformat() for d in dates],
+        "tickers": tickers,
+        "fields": list(fields),
+        "dtype": np.dtype(dtype).name,
+    }))
+    return PricePanel(path)
+
+
+class PricePanel:
+    """
+    Read-only, memory-mapped dates x tickers x fields price panel written by build_panel.
+
+    Slicing `values` never copies: pages are shared through the OS page cache
+    by every process that opens the same panel. Pickling a PricePanel sends
+    only its path, so worker processes reopen the map instead of receiving a
+    copy of the prices, and resident memory stays flat as workers are added.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, INDEX_FILE), "r") as f:
+            index = json.load(f)
+        self.dates = pd.DatetimeIndex(index["dates"], name="Date")
+        self.tickers = list(index["tickers"])
+        self.fields = list(index["fields"])
+        self.values = np.load(os.path.join(path, VALUES_FILE), mmap_mode="r")
+        self._ticker_pos = {t: i for i, t in enumerate(self.tickers)}
+        self._field_pos = {f: i for i, f in enumerate(self.fields)}
+
+    def __reduce__(self):
+        return (PricePanel, (self.path,))
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def __contains__(self, ticker) -> bool:
+        return str(ticker) in self._ticker_pos
+
+    def __repr__(self) -> str:
+        return (f"PricePanel({self.path!r}, dates={len(self.dates)}, tickers={len(self.tickers)}, "
+                f"fields={self.fields})")
+
+    def _ticker(self, ticker) -> int:
+        try:
+            return self._ticker_pos[str(ticker)]
+        except KeyError:
+            raise KeyError(f"Ticker not in panel: {ticker}") from None
+
+    def n_rows(self, ticker=None) -> int:
+        """Bars stored for one ticker (dates with any field present), or for all tickers when None."""
+        values = self.values if ticker is None else self.values[:, self._ticker(ticker)]
+        return int((~np.isnan(values).all(axis=-1)).sum())
+
+    def field(self, name: str) -> np.ndarray:
+        """Zero-copy dates x tickers view of one field."""
+        return self.values[:, :, self._field_pos[name]]
+
+    def frame(self, ticker, fields=None, start=None, end=None) -> pd.DataFrame:
+        """
+        One ticker's bars as a DataFrame indexed by date, like clean_data output.
+        Dates where the ticker has no bar are dropped; start/end are inclusive bounds.
+        """
+        fields = list(fields) if fields is not None else self.fields
+        lo = 0 if start is None else self.dates.searchsorted(pd.Timestamp(start), side="left")
+        hi = len(self.dates) if end is None else self.dates.searchsorted(pd.Timestamp(end), side="right")
+        columns = [self._field_pos[f] for f in fields]
+        block = np.asarray(self.values[lo:hi, self._ticker(ticker)][:, columns])
+        present = ~np.isnan(block).all(axis=1)
+        return pd.DataFrame(block[present], index=self.dates[lo:hi][present], columns=fields)
+
+    def items(self, tickers=None):
+        """(ticker, frame) pairs, read one ticker at a time."""
+        for ticker in (tickers if tickers is not None else self.tickers):
+            yield ticker, self.frame(ticker)
+
+
+def as_frame(data, ticker) -> pd.DataFrame:
+    """Resolve a per-ticker input that may be a PricePanel to that ticker's DataFrame."""
+    return data.frame(ticker) if isinstance(data, PricePanel) else data
@@ -2,38 +2,43 @@ import os
 import json
 import logging
 import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
-from sklearn.metrics import mean_absolute_error, mean_squared_error
-
-from Feature_Engineering import (
-    add_lag_features,
-    add_rolling_features,
-    add_date_features,
-    add_volatility,
-    add_momentum
-)
+
+from Feature_Engineering import build_features
 from Prophet import train_prophet, forecast_prophet
 from arima import train_arima, forecast_arima
+from outputs.plots import plot_arima_forecast, plot_prophet_forecast, plot_residuals, render_plots
+from instrumentation import configure as configure_instrumentation, stage
+from storage import load_frame
+from metrics import score_series
 from utils import setup_logging, set_seed
 
 # Timestamp for versioned outputs
 timestamp = datetime.now().strftime("%Y%m%d_%H%M")
 
-# Create output folders
-os.makedirs("outputs/plots", exist_ok=True)
-os.makedirs("outputs/metrics", exist_ok=True)
-os.makedirs("outputs/logs", exist_ok=True)
-os.makedirs("outputs/reports", exist_ok=True)
-
-# Setup logging
-logging.basicConfig(filename=f"outputs/logs/pipeline_run_{timestamp}.log",
-                    level=logging.INFO,
-                    format="%(asctime)s - %(levelname)s - %(message)s")
-
-def save_plot(fig, filename):
-    fig.savefig(f"outputs/plots/{filename}")
-    logging.info(f"Saved plot: {filename}")
+# preprocessing.py writes its output under <project root>/Data/processed
+PROCESSED_PARQUET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 'Data', 'processed', 'processed_stock_data.parquet')
+
+# Metrics are out-of-sample: models are refitted without the last HOLDOUT_DAYS rows and scored on them
+HOLDOUT_DAYS = 30
+
+def prepare_outputs():
+    """Create output folders and the run log; called when the pipeline runs, not on import."""
+    for folder in ("plots", "metrics", "logs", "reports"):
+        os.makedirs(f"outputs/{folder}", exist_ok=True)
+    logging.basicConfig(filename=f"outputs/logs/pipeline_run_{timestamp}.log",
+                        level=logging.INFO,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
+
+def save_plots(plot_jobs, max_workers=4):
+    """Render deferred (plot_func, args, filename) jobs into outputs/plots in a thread pool."""
+    jobs = [(func, args, f"outputs/plots/{filename}") for func, args, filename in plot_jobs]
+    saved, failures = render_plots(jobs, max_workers=max_workers)
+    for path in saved:
+        logging.info(f"Saved plot: {os.path.basename(path)}")
+    for path, error in failures.items():
+        logging.error(f"Failed to save plot {os.path.basename(path)}: {error}")
 
 def save_metrics(metrics_dict, filename):
     with open(f"outputs/metrics/{filename}", "w") as f:
@@ -50,33 +55,45 @@ def save_report(metrics_dict, filename="summary.md"):
             f.write("\n")
     logging.info(f"Saved report: {filename}")
 
-def run_pipeline():
+def run_pipeline(profile=False, plots=True):
+    prepare_outputs()
     setup_logging()
     set_seed()
+    # Per-stage timing/memory records; profile=True also dumps a cProfile file per stage
+    configure_instrumentation(
+        metrics_path=f"outputs/metrics/stages_{timestamp}.jsonl",
+        profile_dir=f"outputs/metrics/profiles_{timestamp}" if profile else None,
+    )
 
-    # Load preprocessed data
+    # Load preprocessed data (columnar copy written by preprocessing.py first, CSV as a fallback)
     try:
-        df = pd.read_csv('processed_stock_data.csv')
-        print("Loaded processed_stock_data.csv")
-        logging.info("Loaded processed_stock_data.csv")
+        with stage("load") as rec:
+            if os.path.exists(PROCESSED_PARQUET):
+                df = load_frame(PROCESSED_PARQUET)
+                print("Loaded processed_stock_data.parquet")
+                logging.info("Loaded processed_stock_data.parquet")
+            else:
+                df = pd.read_csv('processed_stock_data.csv')
+                print("Loaded processed_stock_data.csv")
+                logging.info("Loaded processed_stock_data.csv")
+            rec["rows"] = len(df)
     except FileNotFoundError:
-        print("File not found: Run preprocessing.py first to generate processed_stock_data.csv")
-        logging.error("processed_stock_data.csv not found")
+        print("File not found: Run preprocessing.py first to generate processed_stock_data.parquet")
+        logging.error("processed_stock_data not found")
         return
 
     # Feature Engineering
     try:
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df = df.dropna(subset=['Date']).sort_values('Date')
-        df = df.set_index('Date')
+        with stage("feature_engineering", rows=len(df)) as rec:
+            if not isinstance(df.index, pd.DatetimeIndex):
+                df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+                df = df.dropna(subset=['Date']).sort_values('Date')
+                df = df.set_index('Date')
 
-        df = add_lag_features(df, column='Close')
-        df = add_rolling_features(df, column='Close')
-        df = add_date_features(df, date_col=df.index.to_series())
-        df = add_volatility(df, column='Close')
-        df = add_momentum(df, column='Close')
+            df = build_features(df, column='Close')
 
-        df = df.dropna()
+            df = df.dropna()
+            rec["columns"] = df.shape[1]
         print("🔧 Feature engineering complete")
         logging.info("Feature engineering complete")
     except Exception as e:
@@ -85,28 +102,33 @@ def run_pipeline():
         return
 
     all_metrics = {}
+    train, actual = df.iloc[:-HOLDOUT_DAYS], df["Close"].iloc[-HOLDOUT_DAYS:]
+    # Figures are only described here and rendered together at the end (skipped if plots=False)
+    plot_jobs = []
 
     # Prophet Forecasting
     try:
         prophet_df = df.reset_index()[['Date', 'Close']].rename(columns={'Date': 'ds', 'Close': 'y'})
-        prophet_model = train_prophet(prophet_df)
-        prophet_forecast, prophet_fig = forecast_prophet(prophet_model, periods=30)
-
-        save_plot(prophet_fig, f"prophet_forecast_{timestamp}.png")
-
-        prophet_metrics = {
-            "MAE": mean_absolute_error(prophet_df["y"], prophet_forecast["yhat"]),
-            "RMSE": mean_squared_error(prophet_df["y"], prophet_forecast["yhat"], squared=False)
-        }
+        # The holdout model is fitted first and only on the training slice; the full fit then
+        # warm-starts from it, so no holdout data reaches the model that is scored
+        with stage("prophet_holdout", rows=len(train)):
+            holdout_model = train_prophet(prophet_df.iloc[:-HOLDOUT_DAYS], uncertainty_samples=0)
+            predicted = holdout_model.predict(pd.DataFrame({"ds": actual.index}))["yhat"]
+            predicted.index = actual.index
+        with stage("prophet_fit", rows=len(prophet_df)):
+            prophet_model = train_prophet(prophet_df, init=holdout_model)
+        with stage("prophet_forecast"):
+            prophet_forecast = forecast_prophet(prophet_model, periods=30)
+        plot_jobs.append((plot_prophet_forecast, (prophet_model, prophet_forecast),
+                          f"prophet_forecast_{timestamp}.png"))
+
+        prophet_metrics = score_series(df["Close"], predicted)
         save_metrics(prophet_metrics, f"prophet_metrics_{timestamp}.json")
         all_metrics["Prophet"] = prophet_metrics
 
         # Residual plot
-        residuals = prophet_df["y"] - prophet_forecast["yhat"]
-        fig, ax = plt.subplots()
-        ax.plot(residuals)
-        ax.set_title("Prophet Residuals")
-        save_plot(fig, f"prophet_residuals_{timestamp}.png")
+        residuals = actual - predicted
+        plot_jobs.append((plot_residuals, (residuals, "Prophet Residuals"), f"prophet_residuals_{timestamp}.png"))
 
         print(" Prophet forecast:")
         print(prophet_forecast.tail())
@@ -117,24 +139,23 @@ def run_pipeline():
 
     # ARIMA Forecasting
     try:
-        arima_model = train_arima(df['Close'], order=(5, 1, 0))
-        arima_forecast, arima_fig = forecast_arima(arima_model, steps=30)
-
-        save_plot(arima_fig, f"arima_forecast_{timestamp}.png")
-
-        arima_metrics = {
-            "MAE": mean_absolute_error(df["Close"][-30:], arima_forecast),
-            "RMSE": mean_squared_error(df["Close"][-30:], arima_forecast, squared=False)
-        }
+        with stage("arima_fit", rows=len(df)):
+            arima_model = train_arima(df['Close'], order=(5, 1, 0))
+        with stage("arima_forecast"):
+            arima_forecast = forecast_arima(arima_model, steps=30)
+        plot_jobs.append((plot_arima_forecast, (arima_forecast,), f"arima_forecast_{timestamp}.png"))
+
+        with stage("arima_holdout", rows=len(train)):
+            holdout_model = train_arima(train['Close'], order=(5, 1, 0))
+            # ARIMA steps are observations, so step h lands on the h-th held-out trading day
+            predicted = pd.Series(forecast_arima(holdout_model, steps=HOLDOUT_DAYS).to_numpy(), index=actual.index)
+        arima_metrics = score_series(df["Close"], predicted)
         save_metrics(arima_metrics, f"arima_metrics_{timestamp}.json")
         all_metrics["ARIMA"] = arima_metrics
 
         # Residual plot
-        residuals = df["Close"][-30:] - arima_forecast
-        fig, ax = plt.subplots()
-        ax.plot(residuals)
-        ax.set_title("ARIMA Residuals")
-        save_plot(fig, f"arima_residuals_{timestamp}.png")
+        residuals = actual - predicted
+        plot_jobs.append((plot_residuals, (residuals, "ARIMA Residuals"), f"arima_residuals_{timestamp}.png"))
 
         print("ARIMA forecast:")
         print(arima_forecast.tail())
@@ -143,9 +164,14 @@ def run_pipeline():
         print(f"⚠️ ARIMA forecasting failed: {e}")
         logging.error(f"ARIMA forecasting failed: {e}")
 
+    if plots and plot_jobs:
+        with stage("plots", figures=len(plot_jobs)):
+            save_plots(plot_jobs)
+
     # Save summary report
     try:
-        save_report(all_metrics, filename=f"summary_{timestamp}.md")
+        with stage("report"):
+            save_report(all_metrics, filename=f"summary_{timestamp}.md")
     except Exception as e:
         logging.error(f"Failed to save summary report: {e}")
 
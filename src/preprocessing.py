@@ -1,5 +1,14 @@
 import pandas as pd
 import os
+import shutil
+import tempfile
+
+try:
+    from .dtype_policy import apply_dtype_policy, compact_dtypes, widen_dtypes
+    from .storage import save_frame
+except ImportError:
+    from dtype_policy import apply_dtype_policy, compact_dtypes, widen_dtypes
+    from storage import save_frame
 
 def load_raw_data(filepath: str) -> pd.DataFrame:
     """Load raw CSV data from a given filepath."""
@@ -25,11 +34,11 @@ def validate_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 def engineer_time_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Add time-based features from the datetime index."""
-    df['Year'] = df.index.year
-    df['Month'] = df.index.month
-    df['Day'] = df.index.day
-    df['Weekday'] = df.index.weekday
+    """Add time-based features from the datetime index, stored as int16/int8."""
+    df['Year'] = df.index.year.astype('int16')
+    df['Month'] = df.index.month.astype('int8')
+    df['Day'] = df.index.day.astype('int8')
+    df['Weekday'] = df.index.weekday.astype('int8')
     return df
 
 def fill_missing_values(df: pd.DataFrame) -> pd.DataFrame:
@@ -37,14 +46,18 @@ def fill_missing_values(df: pd.DataFrame) -> pd.DataFrame:
     return df.ffill().bfill()
 
 def save_cleaned_data(df: pd.DataFrame, output_path: str) -> None:
-    """Save cleaned DataFrame to a CSV file."""
+    """Save cleaned DataFrame to CSV, or to Parquet/Feather when the path has that extension."""
+    if output_path.endswith((".parquet", ".feather")):
+        save_frame(df, output_path)
+        return
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     df.to_csv(output_path)
 
-def preprocess_pipeline(input_path: str, output_path: str) -> None:
+def preprocess_pipeline(input_path: str, output_path: str, compact: bool = False) -> None:
     """
     Full preprocessing pipeline from raw CSV to cleaned output file.
     Preserves original behavior for CLI or script-based execution.
+    With compact=True the output gets the dtype_policy dtypes (float32 prices, int Volume).
     """
     script_dir = os.path.dirname(os.path.abspath(__file__))
     full_input_path = os.path.join(script_dir, input_path)
@@ -58,21 +71,182 @@ def preprocess_pipeline(input_path: str, output_path: str) -> None:
     df = validate_numeric_columns(df)
     df = fill_missing_values(df)
     df = engineer_time_features(df)
+    if compact:
+        df = apply_dtype_policy(df)
     save_cleaned_data(df, full_output_path)
     print(f"Preprocessing complete. Saved to {full_output_path}")
 
-def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+def clean_data(df: pd.DataFrame, compact: bool = False) -> pd.DataFrame:
     """
     Modular preprocessing function for use in Streamlit or other apps.
     Accepts a DataFrame and returns a cleaned version.
+    With compact=True prices are downcast to float32 (see dtype_policy.apply_dtype_policy).
     """
     df = convert_and_sort_dates(df)
     df = validate_numeric_columns(df)
     df = fill_missing_values(df)
     df = engineer_time_features(df)
+    if compact:
+        df = apply_dtype_policy(df)
     return df
 
+RAW_DTYPES = {'Date': str, 'Open': str, 'High': str, 'Low': str, 'Close': str, 'Volume': str}
+
+def iter_raw_chunks(filepath: str, chunksize: int = 100_000, dtype=None):
+    """
+    Read a raw CSV in chunks with explicit dtypes.
+    Columns default to str so malformed rows never force a full-file dtype inference;
+    validate_numeric_columns converts them per chunk.
+    """
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"File not found: {filepath}")
+    return pd.read_csv(filepath, chunksize=chunksize, dtype=dtype or RAW_DTYPES)
+
+def clean_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """Date parsing, numeric validation and chunk-local sort; filling is done on the sorted stream."""
+    df = convert_and_sort_dates(df)
+    df = validate_numeric_columns(df)
+    # Fixed dtypes so every part file shares one schema, whatever each chunk happened to contain
+    numeric_cols = [col for col in ['Open', 'High', 'Low', 'Close', 'Volume'] if col in df.columns]
+    return df.astype({col: 'float64' for col in numeric_cols})
+
+class _StreamFiller:
+    """
+    Forward/backward fill across chunk boundaries of a date-sorted stream.
+
+    Carries the last seen value of every column into the next chunk. Leading
+    rows are held back until each column has a value to back-fill from, but at
+    most max_pending rows, so a column that is empty everywhere cannot grow the buffer.
+    """
+
+    def __init__(self, max_pending: int = 100_000):
+        self.last = None
+        self.pending = []
+        self.max_pending = max_pending
+
+    def push(self, df: pd.DataFrame):
+        if self.last is not None:
+            return [self._ffill(df)]
+        self.pending.append(df)
+        combined = pd.concat(self.pending)
+        if combined.notna().any().all() or len(combined) >= self.max_pending:
+            self.pending = []
+            return [self._ffill(combined.bfill())]
+        return []
+
+    def flush(self):
+        if not self.pending:
+            return []
+        combined = pd.concat(self.pending)
+        self.pending = []
+        return [self._ffill(combined.bfill())]
+
+    def _ffill(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.last is not None:
+            df = pd.concat([self.last, df]).ffill().iloc[1:]
+        else:
+            df = df.ffill()
+        self.last = df.iloc[[-1]]
+        return df
+
+def _iter_sorted_runs(run_paths, batch_rows: int):
+    """
+    K-way merge of date-sorted Parquet runs, yielding sorted DataFrame batches.
+
+    Holds at most one batch of batch_rows per run in memory. Each round emits every buffered
+    row up to the smallest "last date" across the buffers. No unread row can
+    sort before that bound.
+    """
+    import pyarrow.parquet as pq
+
+    readers = [pq.ParquetFile(path).iter_batches(batch_size=batch_rows) for path in run_paths]
+    buffers = [None] * len(readers)
+
+    def refill(i):
+        batch = next(readers[i], None)
+        buffers[i] = None if batch is None else batch.to_pandas()
+
+    for i in range(len(readers)):
+        refill(i)
+    while any(b is not None for b in buffers):
+        active = [i for i, b in enumerate(buffers) if b is not None]
+        bound = min(buffers[i].index[-1] for i in active)
+        ready = []
+        for i in active:
+            cut = buffers[i].index.searchsorted(bound, side='right')
+            ready.append(buffers[i].iloc[:cut])
+            buffers[i] = buffers[i].iloc[cut:]
+            if buffers[i].empty:
+                refill(i)
+        yield pd.concat(ready).sort_index(kind='stable')
+
+def stream_preprocess(input_path: str, output_dir: str, chunksize: int = 100_000, tmp_dir: str = None,
+                      compact: bool = False, max_pending: int = 1_000_000) -> list:
+    """
+    Preprocess a raw CSV larger than memory into Parquet part files under output_dir.
+
+    Produces the same rows as clean_data but never holds more than a few chunks
+    in memory. Chunks are cleaned independently. If the file is not already in
+    date order, the sorted chunks are spilled to temporary runs and merged
+    (external merge sort) before filling. Fill state carries across chunk
+    boundaries. Returns the written part paths; read them back with
+    pd.read_parquet(output_dir). With compact=True columns get the dtypes
+    clean_data(compact=True) would give them (dtype_policy.compact_dtypes), decided
+    over all chunks before any part is written.
+
+    Leading rows are held back (up to max_pending rows, independent of chunksize)
+    until every column has a value to back-fill them from. Only a column whose
+    first value comes after max_pending rows keeps leading NaNs where clean_data
+    would back-fill them.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    work_dir = tempfile.mkdtemp(dir=tmp_dir, prefix='stream_preprocess_')
+    try:
+        run_paths, in_order, last_date, casts = [], True, None, None
+        for i, chunk in enumerate(iter_raw_chunks(input_path, chunksize)):
+            chunk = clean_chunk(chunk)
+            if chunk.empty:
+                continue
+            if compact:
+                # The same checks as apply_dtype_policy, widened over every chunk so each
+                # value survives the casts and all part files share one schema
+                chunk_casts = compact_dtypes(chunk)
+                casts = chunk_casts if casts is None else widen_dtypes(casts, chunk_casts)
+            if last_date is not None and chunk.index[0] < last_date:
+                in_order = False
+            last_date = chunk.index[-1]
+            run_path = os.path.join(work_dir, f'run-{i:05d}.parquet')
+            save_frame(chunk, run_path)
+            run_paths.append(run_path)
+
+        if in_order:
+            # Already sorted across chunks: runs can be streamed back one after another
+            batches = (pd.read_parquet(path) for path in run_paths)
+        else:
+            # One buffer per run is held during the merge, so split chunksize rows between them
+            batches = _iter_sorted_runs(run_paths, max(1, chunksize // len(run_paths)))
+
+        filler = _StreamFiller(max_pending=max_pending)
+        part_paths = []
+
+        def write(frames):
+            for frame in frames:
+                part_path = os.path.join(output_dir, f'part-{len(part_paths):05d}.parquet')
+                frame = engineer_time_features(frame)
+                if casts:
+                    frame = frame.astype(casts)
+                save_frame(frame, part_path)
+                part_paths.append(part_path)
+
+        for batch in batches:
+            if not batch.empty:
+                write(filler.push(batch))
+        write(filler.flush())
+        return part_paths
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
 if __name__ == "__main__":
     input_path = "ITC_stock_data.csv"
-    output_path = "processed_stock_data.csv"
-    preprocess_pipeline(input_path, output_path)
+    output_path = "processed_stock_data.parquet"
+    preprocess_pipeline(input_path, output_path, compact=True)
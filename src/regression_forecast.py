@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+try:
+    from .Feature_Engineering import IncrementalFeatureState, build_features
+except ImportError:
+    from Feature_Engineering import IncrementalFeatureState, build_features
+
+
+def default_regressors() -> dict:
+    """The sklearn models compared in Model_comparision.py, freshly constructed."""
+    return {
+        'LinearRegression': LinearRegression(),
+        'RandomForest': RandomForestRegressor(n_estimators=100, random_state=42),
+    }
+
+
+def make_supervised(df: pd.DataFrame, column: str = 'Close', features: pd.DataFrame = None):
+    """
+    Features built from `column` alone at day t, with the next day's value as the target.
+    Other OHLCV columns are left out because they are unknown on forecast days.
+    """
+    if features is None:
+        features = build_features(df[[column]], column)
+    target = features[column].shift(-1).rename('target')
+    data = pd.concat([features, target], axis=1).dropna()
+    return data.drop(columns=['target']), data['target']
+
+
+def run_regressor_model(df: pd.DataFrame, horizon: int, model=None, column: str = 'Close') -> pd.DataFrame:
+    """
+    Fit a one-step-ahead regressor and forecast `horizon` days recursively.
+
+    Each prediction is fed back through an IncrementalFeatureState, so the
+    lag/rolling features for the next step cost O(1) instead of a rebuild.
+    Future dates follow run_arima_model (consecutive calendar days).
+    """
+    model = clone(model) if model is not None else LinearRegression()
+    features = build_features(df[[column]], column)
+    X, y = make_supervised(df, column, features)
+    model.fit(X.to_numpy(), y.to_numpy())
+
+    state = IncrementalFeatureState.from_history(df[[column]], column)
+    last_row = features.iloc[[-1]][X.columns]
+    future_dates = pd.date_range(start=df.index[-1], periods=horizon + 1, freq='D')[1:]
+    predictions = []
+    for date in future_dates:
+        value = float(model.predict(last_row.to_numpy())[0])
+        predictions.append(value)
+        new_bar = pd.DataFrame({column: [value]}, index=pd.DatetimeIndex([date], name=df.index.name))
+        last_row = state.update(new_bar)[X.columns]
+
+    return pd.DataFrame({'Date': future_dates, 'Forecast': np.asarray(predictions)}).set_index('Date')
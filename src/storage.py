@@ -0,0 +1,199 @@
+import os
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Parquet and Feather both need pyarrow; pandas raises an ImportError naming it if missing.
+SUPPORTED_FORMATS = ("parquet", "feather")
+
+
+def _infer_format(path: str, fmt: str = None) -> str:
+    if fmt is None:
+        fmt = os.path.splitext(path)[1].lstrip(".").lower() or "parquet"
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported storage format: {fmt}")
+    return fmt
+
+
+@contextmanager
+def file_lock(path: str):
+    """Exclusive advisory lock on path, held across processes and threads until the block exits."""
+    with open(path, "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def atomic_path(path: str):
+    """
+    Yield a unique temporary path to write path's new content to.
+
+    When the block succeeds the file is renamed over path in one step, so
+    readers see either the old or the new file and concurrent writers never
+    share a temporary file; on error it is removed. The dot-prefixed name is
+    ignored by Parquet dataset readers.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write(path: str, data) -> None:
+    """Write str or bytes to path atomically (see atomic_path)."""
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, "wb" if isinstance(data, bytes) else "w") as f:
+            f.write(data)
+
+
+def _date_filters(start=None, end=None, date_col="Date"):
+    filters = []
+    if start is not None:
+        filters.append((date_col, ">=", pd.Timestamp(start)))
+    if end is not None:
+        filters.append((date_col, "<=", pd.Timestamp(end)))
+    return filters
+
+
+def save_frame(df: pd.DataFrame, path: str, fmt: str = None) -> None:
+    """
+    Save a frame with a DatetimeIndex to Parquet or Feather, keeping dtypes and the index.
+    The format is taken from the file extension unless fmt is given.
+    """
+    fmt = _infer_format(path, fmt)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if fmt == "parquet":
+        df.to_parquet(path)
+    elif isinstance(df.index, pd.RangeIndex):
+        df.reset_index(drop=True).to_feather(path)
+    else:
+        # Feather only stores a default RangeIndex, so keep the date index as a column
+        df.reset_index().to_feather(path)
+
+
+def load_frame(path: str, columns=None, start=None, end=None, fmt: str = None,
+               date_col: str = "Date") -> pd.DataFrame:
+    """
+    Load a frame written by save_frame.
+
+    Parameters:
+    - columns: Optional list of columns to read (the date index is always restored)
+    - start, end: Optional inclusive date bounds, pushed down to the Parquet reader
+    - date_col: Name of the stored date index; None for frames saved without one
+      (e.g. backtest results), which are returned as stored
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    fmt = _infer_format(path, fmt)
+    if date_col is None and (start is not None or end is not None):
+        raise ValueError("Date bounds need a date_col.")
+    filters = _date_filters(start, end, date_col)
+    if fmt == "parquet":
+        return pd.read_parquet(path, columns=columns, filters=filters or None)
+    if date_col is None:
+        return pd.read_feather(path, columns=columns)
+
+    read_cols = None if columns is None else [date_col] + [c for c in columns if c != date_col]
+    df = pd.read_feather(path, columns=read_cols).set_index(date_col)
+    if start is not None:
+        df = df[df.index >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df.index <= pd.Timestamp(end)]
+    return df
+
+
+def ticker_path(root: str, ticker: str, fmt: str = "parquet", partition_col: str = "Ticker") -> str:
+    """Location of a ticker's file in the partitioned layout root/<partition_col>=<ticker>/data.<fmt>."""
+    return os.path.join(root, f"{partition_col}={ticker}", f"data.{fmt}")
+
+
+def save_partitioned(frames: dict, root: str, fmt: str = "parquet", partition_col: str = "Ticker") -> None:
+    """Write one file per ticker under root, replacing any existing file for that ticker."""
+    for ticker, df in frames.items():
+        save_frame(df, ticker_path(root, ticker, fmt, partition_col), fmt)
+
+
+def append_partition(df: pd.DataFrame, root: str, ticker: str, partition_col: str = "Ticker") -> str:
+    """
+    Atomically add a Parquet part file with new rows to a ticker's partition.
+
+    The part is written under a dot-prefixed temporary name, which readers
+    ignore, and renamed into place. A crash therefore never leaves a partial
+    part visible. Returns the part path.
+    """
+    if df.empty:
+        return None
+    directory = os.path.dirname(ticker_path(root, ticker, "parquet", partition_col))
+    start, end = df.index.min(), df.index.max()
+    part_path = os.path.join(directory, f"part-{start:%Y%m%d}-{end:%Y%m%d}-{uuid.uuid4().hex[:8]}.parquet")
+    with atomic_path(part_path) as tmp_path:
+        df.to_parquet(tmp_path)
+    return part_path
+
+
+def last_stored_date(root: str, ticker: str, partition_col: str = "Ticker"):
+    """Latest date stored for ticker in a partitioned Parquet store, or None if it has no data."""
+    directory = os.path.dirname(ticker_path(root, ticker, "parquet", partition_col))
+    if not os.path.isdir(directory) or not any(n.endswith(".parquet") for n in os.listdir(directory)):
+        return None
+    # An empty projection reads only the stored date index, which keeps this cheap for long histories
+    dates = pd.read_parquet(directory, columns=[])
+    return dates.index.max() if len(dates) else None
+
+
+def list_tickers(root: str, partition_col: str = "Ticker") -> list:
+    """Tickers present in a partitioned store."""
+    if not os.path.isdir(root):
+        return []
+    prefix = f"{partition_col}="
+    return sorted(name[len(prefix):] for name in os.listdir(root) if name.startswith(prefix))
+
+
+def load_partitioned(root: str, tickers=None, columns=None, start=None, end=None,
+                     fmt: str = "parquet", partition_col: str = "Ticker") -> pd.DataFrame:
+    """
+    Load a long-format frame from a partitioned store, with a categorical ticker column.
+    Ticker and date filters only touch the matching partitions and row groups.
+    """
+    if fmt == "parquet":
+        filters = _date_filters(start, end)
+        if tickers is not None:
+            filters.append((partition_col, "in", list(tickers)))
+        read_cols = None if columns is None else list(columns) + [partition_col]
+        return pd.read_parquet(root, columns=read_cols, filters=filters or None)
+
+    frames = []
+    for ticker in (tickers if tickers is not None else list_tickers(root, partition_col)):
+        df = load_frame(ticker_path(root, ticker, fmt, partition_col), columns, start, end, fmt)
+        frames.append(df.assign(**{partition_col: ticker}))
+    df = pd.concat(frames) if frames else pd.DataFrame()
+    if partition_col in df.columns:
+        df[partition_col] = df[partition_col].astype("category")
+    return df
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Tests import the project as `src` and `benchmarks`; the Data/ scripts import each other by name
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "Data")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from async_fetcher import AsyncFetcher, ResponseCache
+
+
+def serve(handler, run):
+    """Run `run(base_url)` against a local stub server whose every request goes to handler."""
+    async def main():
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", handler)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            return await run(str(server.make_url("/")))
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+def flaky(failures: int, status: int = 503):
+    """Handler failing the first `failures` requests with status, then answering 200."""
+    calls = []
+
+    async def handler(request):
+        calls.append(time.monotonic())
+        if len(calls) <= failures:
+            return web.Response(status=status)
+        return web.Response(body=b"ok")
+    return handler, calls
+
+
+FAST = {"rate_per_host": 1000, "burst": 100, "backoff": 0.02}
+
+
+def test_retries_transient_statuses_with_backoff():
+    handler, calls = flaky(2)
+
+    async def run(url):
+        async with AsyncFetcher(retries=3, **FAST) as fetcher:
+            return await fetcher.fetch(url)
+
+    assert serve(handler, run) == b"ok"
+    assert len(calls) == 3
+    # Exponential backoff with jitter: at least backoff * 2**attempt before each retry
+    assert calls[1] - calls[0] >= 0.02
+    assert calls[2] - calls[1] >= 0.04
+
+
+def test_raises_after_last_retry():
+    handler, calls = flaky(10)
+
+    async def run(url):
+        async with AsyncFetcher(retries=2, **FAST) as fetcher:
+            return await fetcher.fetch(url)
+
+    with pytest.raises(aiohttp.ClientResponseError) as info:
+        serve(handler, run)
+    assert info.value.status == 503
+    assert len(calls) == 3
+
+
+def test_does_not_retry_client_errors():
+    handler, calls = flaky(10, status=404)
+
+    async def run(url):
+        async with AsyncFetcher(retries=3, **FAST) as fetcher:
+            return await fetcher.fetch(url)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        serve(handler, run)
+    assert len(calls) == 1
+
+
+def test_connection_limit_caps_concurrent_requests():
+    in_flight, peak = [0], [0]
+
+    async def handler(request):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.05)
+        in_flight[0] -= 1
+        return web.Response(body=request.query["i"].encode())
+
+    async def run(url):
+        async with AsyncFetcher(max_connections=3, **FAST) as fetcher:
+            return await fetcher.fetch_many([(url, {"i": str(i)}) for i in range(12)])
+
+    bodies = serve(handler, run)
+    assert bodies == [str(i).encode() for i in range(12)]
+    assert peak[0] == 3
+
+
+def test_rate_limit_per_host():
+    handler, calls = flaky(0)
+
+    async def run(url):
+        async with AsyncFetcher(rate_per_host=20, burst=1) as fetcher:
+            return await fetcher.fetch_many([(url, {"i": i}) for i in range(5)])
+
+    serve(handler, run)
+    # One token up front, then one every 1/20 s
+    assert calls[-1] - calls[0] >= 4 / 20 * 0.9
+
+
+def test_cached_bodies_skip_the_network(tmp_path):
+    handler, calls = flaky(0)
+    cache = ResponseCache(str(tmp_path), ttl=60)
+
+    async def run(url):
+        async with AsyncFetcher(cache=cache, **FAST) as fetcher:
+            return [await fetcher.fetch(url, {"page": 1}) for _ in range(3)]
+
+    assert serve(handler, run) == [b"ok"] * 3
+    assert len(calls) == 1
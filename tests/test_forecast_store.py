@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.forecast_store import ForecastStore
+
+
+def _forecast(value):
+    return pd.DataFrame({"Forecast": [value, value + 1.0]},
+                        index=pd.date_range("2024-01-02", periods=2, name="Date"))
+
+
+def test_concurrent_puts_on_the_same_key_all_succeed(tmp_path):
+    store = ForecastStore(str(tmp_path))
+
+    def put(worker):
+        for i in range(30):
+            store.put("ITC", "ARIMA", (5, 1, 0), 2, _forecast(float(worker)), "v1", "2024-01-01")
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(put, range(8)))
+
+    forecast = ForecastStore(str(tmp_path)).get("ITC", "ARIMA", (5, 1, 0), 2, data_version="v1")
+    assert forecast["Forecast"].iloc[0] in range(8)
+    assert not [p for p in (tmp_path / "ITC").iterdir() if p.name.endswith(".tmp")]
+
+
+def test_concurrent_puts_keep_every_manifest_entry(tmp_path):
+    def put(worker):
+        store = ForecastStore(str(tmp_path))
+        for h in range(1, 11):
+            store.put("ITC", "ARIMA", (worker, 1, 0), h, _forecast(1.0), "v1", "2024-01-01")
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(put, range(8)))
+
+    store = ForecastStore(str(tmp_path))
+    for worker in range(8):
+        for h in range(1, 11):
+            assert store.get("ITC", "ARIMA", (worker, 1, 0), h, data_version="v1") is not None
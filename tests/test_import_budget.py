@@ -0,0 +1,6 @@
+from benchmarks.run_benchmarks import check_import_budget
+
+
+def test_import_budget():
+    # Each module is imported in a fresh interpreter, so earlier tests cannot warm it up
+    assert check_import_budget() == []
@@ -0,0 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src import order_selection
+from src.order_selection import get_order, load_order_store
+
+
+def test_concurrent_get_order_keeps_every_ticker(tmp_path, monkeypatch):
+    # The search itself is not under test; a fixed order keeps every call fast
+    monkeypatch.setattr(order_selection, "select_order", lambda series, **kwargs: ((1, 1, 0), 1.0))
+    store_path = str(tmp_path / "orders.json")
+    series = pd.Series(np.arange(50.0))
+    tickers = [f"T{i:03d}" for i in range(64)]
+
+    with ThreadPoolExecutor(8) as executor:
+        orders = list(executor.map(lambda t: get_order(t, series, store_path), tickers))
+
+    assert orders == [(1, 1, 0)] * len(tickers)
+    assert sorted(load_order_store(store_path)) == tickers
@@ -0,0 +1,72 @@
+import pandas as pd
+import pyarrow.parquet as pq
+
+from benchmarks.synthetic import make_ohlcv
+from src import preprocessing
+from src.preprocessing import clean_data, stream_preprocess
+
+
+def _shuffled_csv(path, n_rows, seed=0):
+    raw = make_ohlcv(n_rows).sample(frac=1, random_state=seed)
+    raw.to_csv(path, index=False)
+    return raw
+
+
+def _read_parts(output_dir):
+    return pd.read_parquet(output_dir).sort_index()
+
+
+def test_merge_buffers_stay_bounded(tmp_path, monkeypatch):
+    raw = _shuffled_csv(tmp_path / "raw.csv", 20_000)
+    read, emitted, peak = [0], [0], [0]
+    iter_batches = pq.ParquetFile.iter_batches
+
+    def counting_iter_batches(self, *args, **kwargs):
+        for batch in iter_batches(self, *args, **kwargs):
+            read[0] += batch.num_rows
+            peak[0] = max(peak[0], read[0] - emitted[0])
+            yield batch
+
+    merge = preprocessing._iter_sorted_runs
+
+    def counting_merge(run_paths, batch_rows):
+        for batch in merge(run_paths, batch_rows):
+            emitted[0] += len(batch)
+            yield batch
+
+    monkeypatch.setattr(pq.ParquetFile, "iter_batches", counting_iter_batches)
+    monkeypatch.setattr(preprocessing, "_iter_sorted_runs", counting_merge)
+    stream_preprocess(str(tmp_path / "raw.csv"), str(tmp_path / "out"), chunksize=1_000)
+
+    assert emitted[0] == len(raw)
+    # Rows read from the runs but not yet emitted never exceed about one chunk
+    assert peak[0] <= 2 * 1_000
+    pd.testing.assert_frame_equal(_read_parts(tmp_path / "out"), clean_data(raw.copy()),
+                                  check_dtype=False, check_freq=False)
+
+
+def test_late_starting_column_is_back_filled_like_clean_data(tmp_path):
+    raw = make_ohlcv(5_000)
+    raw["Adj Close"] = raw["Close"].astype(float)
+    raw.loc[:2_499, "Adj Close"] = float("nan")
+    raw.to_csv(tmp_path / "raw.csv", index=False)
+
+    stream_preprocess(str(tmp_path / "raw.csv"), str(tmp_path / "out"), chunksize=1_000)
+
+    pd.testing.assert_frame_equal(_read_parts(tmp_path / "out"), clean_data(raw.copy()),
+                                  check_dtype=False, check_freq=False)
+
+
+def test_compact_stream_matches_clean_data_compact(tmp_path):
+    raw = _shuffled_csv(tmp_path / "raw.csv", 5_000)
+    # A later chunk with a larger volume must widen the integer type chosen for the first
+    raw.iloc[-1, raw.columns.get_loc("Volume")] = 3_000_000_000
+
+    raw.to_csv(tmp_path / "raw.csv", index=False)
+    stream_preprocess(str(tmp_path / "raw.csv"), str(tmp_path / "out"), chunksize=1_000, compact=True)
+
+    expected = clean_data(raw.copy(), compact=True)
+    parts = sorted((tmp_path / "out").glob("part-*.parquet"))
+    schemas = {tuple(pd.read_parquet(part).dtypes.astype(str)) for part in parts}
+    assert schemas == {tuple(expected.dtypes.astype(str))}
+    pd.testing.assert_frame_equal(_read_parts(tmp_path / "out"), expected, check_freq=False)
@@ -0,0 +1,60 @@
+import json
+import logging
+
+import pytest
+
+from benchmarks.synthetic import make_universe
+from src import cli, instrumentation
+from src.batch_forecasting import run_batch_forecast
+
+
+@pytest.fixture
+def restore_instrumentation():
+    saved = instrumentation.current_config()
+    yield
+    instrumentation.configure(**saved)
+
+
+def _records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_batch_forecast_workers_emit_stage_records(tmp_path, restore_instrumentation):
+    metrics_path = tmp_path / "stages.jsonl"
+    instrumentation.configure(metrics_path=str(metrics_path))
+    universe = make_universe(4, 120)
+
+    forecast_df, failures = run_batch_forecast(universe, 3, max_workers=2, chunksize=1,
+                                               order_store=str(tmp_path / "orders.json"))
+
+    assert not failures
+    records = [r for r in _records(metrics_path) if r["stage"] == "forecast"]
+    assert sorted(r["ticker"] for r in records) == sorted(universe)
+    assert all(r["status"] == "ok" for r in records)
+
+
+def test_cli_workers_write_stages_and_log(tmp_path, restore_instrumentation):
+    universe = make_universe(2, 120)
+    for ticker, df in universe.items():
+        df.reset_index().to_csv(tmp_path / f"{ticker}_stock_data.csv", index=False)
+    output_dir = tmp_path / "run"
+    log_path = output_dir / "run.log"
+    output_dir.mkdir()
+    root = logging.getLogger()
+    handler = logging.FileHandler(log_path)
+    root.addHandler(handler)
+    try:
+        instrumentation.configure(metrics_path=str(output_dir / "stages.jsonl"))
+        checkpoint = cli.run_batch(cli.resolve_inputs([str(tmp_path / "*_stock_data.csv")]), ["ARIMA", "NOPE"],
+                                   3, str(output_dir), workers=2)
+    finally:
+        root.removeHandler(handler)
+        handler.close()
+
+    assert all(entry["status"] == "done" for entry in checkpoint.values())
+    stages = {(r["stage"], r["ticker"]) for r in _records(output_dir / "stages.jsonl")}
+    for ticker in universe:
+        assert {("preprocess", ticker), ("features", ticker), ("fit", ticker), ("forecast", ticker)} <= stages
+    # The unknown model fails inside the workers, which must log to the parent's file
+    assert "NOPE failed" in log_path.read_text()